@@ -3,26 +3,32 @@ import typer
 from rich import print
 from rich.table import Table
 
-from blackbox.store import Store
-from blackbox.seal import verify_chain_with_payloads
-from blackbox.util import safe_path_component
+# blackbox imports are deferred to command bodies: importing the package pulls
+# in pandas/pyarrow, which would otherwise slow down `bb --help`.
 
 app = typer.Typer(add_completion=False)
 
-def _store_local(root: str) -> Store:
+def _store_local(root: str):
+    from blackbox.store import Store
     return Store.local(root)
 
 @app.command()
 def list_runs(root: str, project: str, dataset: str):
+    from blackbox.util import safe_path_component
     store = _store_local(root)
     prefix = f"{safe_path_component(project)}/{safe_path_component(dataset)}/"
-    keys = store.list(prefix)
-    runs = sorted({k.split("/")[2] for k in keys if k.startswith(prefix) and len(k.split("/")) >= 3})
-    for r in runs:
-        print(r)
+    # iter_list(prefix) only yields keys under prefix; split once, stopping after the run id.
+    # Run ids are printed as they are first seen, so memory stays O(runs) not O(keys).
+    seen: set[str] = set()
+    for k in store.iter_list(prefix):
+        parts = k.split("/", 3)
+        if len(parts) >= 3 and parts[2] not in seen:
+            seen.add(parts[2])
+            print(parts[2])
 
 @app.command()
 def inspect(root: str, project: str, dataset: str, run_id: str):
+    from blackbox.util import safe_path_component
     store = _store_local(root)
     run_key = f"{safe_path_component(project)}/{safe_path_component(dataset)}/{run_id}/run.json"
     run = store.get_json(run_key)
@@ -45,6 +51,8 @@ def inspect(root: str, project: str, dataset: str, run_id: str):
 
 @app.command()
 def verify(root: str, project: str, dataset: str, run_id: str):
+    from blackbox.seal import verify_chain_with_payloads
+    from blackbox.util import safe_path_component
     store = _store_local(root)
     prefix = f"{safe_path_component(project)}/{safe_path_component(dataset)}/{run_id}"
     run = store.get_json(f"{prefix}/run.json")
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import functools
+import gc
+import time
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from blackbox import Recorder, Run, Store, DiffConfig, SnapshotConfig, SealConfig
+from blackbox.hashing import diff_rowhash, content_fingerprint_rowhash
+from blackbox.store import encode_parquet
+
+
+def make_df(n: int, *, categorical: bool = False) -> pd.DataFrame:
+    """
+    Synthetic benchmark frame (id/email/country/active/score).
+    Built from NumPy arrays so input generation stays out of the way at 1M+ rows.
+
+    categorical=True stores the constant `country` column as int8 codes plus a
+    one-entry dictionary instead of per-row strings. `email` is unique per row,
+    so it stays a string column either way.
+    """
+    ids = np.arange(1, n + 1, dtype=np.int64)
+    emails = ("user" + pd.Series(ids).astype(str) + "@example.com").to_numpy()
+    if categorical:
+        country = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=["US"])
+    else:
+        country = np.full(n, "US", dtype=object)
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "email": emails,
+            "country": country,
+            "active": np.ones(n, dtype=bool),
+            "score": np.arange(n, dtype=np.int64),
+        },
+        copy=False,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _delta_frame(start: int, count: int, *, unique_emails: bool = False) -> pd.DataFrame:
+    """
+    Rows appended by the mutators, built once per (start, count) and reused.
+    Callers must not modify the result; pd.concat copies it into the output.
+    """
+    ids = np.arange(start, start + count, dtype=np.int64)
+    if unique_emails:
+        emails = ("new" + pd.Series(ids).astype(str) + "@example.com").to_numpy()
+    else:
+        emails = np.full(count, "x", dtype=object)
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "email": emails,
+            "country": np.full(count, "US", dtype=object),
+            "active": np.ones(count, dtype=bool),
+            "score": np.ones(count, dtype=np.int64),
+        },
+        copy=False,
+    )
+
+
+def _mutate_bench(df: pd.DataFrame) -> pd.DataFrame:
+    n = len(df)
+
+    # ids are the dense sequence 1..n, so label slices replace isin() masks.
+    out = df.set_index("id", drop=False)
+    out = out.drop(index=range(1, min(301, n + 1)))
+    lo, hi = min(10_000, n), min(10_400, n)
+    if hi > lo:
+        out.loc[lo : hi - 1, "active"] = False
+        out.loc[lo : hi - 1, "score"] += 9999
+
+    out = pd.concat([out, _delta_frame(n + 1, 250, unique_emails=True)], ignore_index=True)
+    return out
+
+
+def _mutate_load(df: pd.DataFrame) -> pd.DataFrame:
+    n = len(df)
+    out = df.copy()
+    mask = out["id"].to_numpy() % 100 == 0
+    out.loc[mask, "active"] = False
+    out.loc[mask, "score"] += 123
+    out = pd.concat([out, _delta_frame(n + 1, 500)], ignore_index=True)
+    return out
+
+
+def _mutate_stress(df: pd.DataFrame) -> pd.DataFrame:
+    n = len(df)
+    out = df.copy()
+    mask = out["id"].to_numpy() % 1000 == 0
+    out.loc[mask, "active"] = False
+    out.loc[mask, "score"] += 9999
+    out = pd.concat([out, _delta_frame(n + 1, 2000)], ignore_index=True)
+    return out
+
+
+_MUTATORS: dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    # bench: drop 300 ids, change 400, add 250 (low churn, exercises key lists)
+    "bench": _mutate_bench,
+    # load: change every 100th row, add 500
+    "load": _mutate_load,
+    # stress: change every 1000th row, add 2000
+    "stress": _mutate_stress,
+}
+
+
+def mutate_df(df: pd.DataFrame, style: str = "bench") -> pd.DataFrame:
+    """
+    Return a changed copy of a make_df() frame using the named mutation style.
+    """
+    try:
+        fn = _MUTATORS[style]
+    except KeyError:
+        raise ValueError(f"Unknown mutate style: {style} (expected one of {sorted(_MUTATORS)})") from None
+    out = fn(df)
+    # Appended rows are built from plain values; restore categorical columns so
+    # df and its mutation keep the same layout.
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and out[col].dtype != dtype:
+            out[col] = out[col].astype(dtype)
+    return out
+
+
+def quick_fingerprint(df: pd.DataFrame) -> int:
+    """
+    Cheap order-insensitive content fingerprint for harness sanity checks.
+    """
+    return int(pd.util.hash_pandas_object(df, index=False).to_numpy().sum())
+
+
+def global_warmup() -> None:
+    """
+    Pay one-time costs (lazy imports, first-call setup) once per process, not per size.
+    """
+    df = make_df(1000)
+    content_fingerprint_rowhash(df, order_sensitive=False, sample_rows=0)
+    diff_rowhash(df, mutate_df(df), primary_key=["id"], order_sensitive=False)
+
+
+def run_timed(fn: Callable[[], Any], *, runs: int, warmup: int = 0) -> list[int]:
+    """
+    Call fn `warmup` times untimed, then `runs` times; return per-run nanoseconds.
+
+    A full collection runs before every timed call (outside the timed region)
+    so garbage from earlier calls isn't collected on the clock.
+    """
+    for _ in range(warmup):
+        fn()
+        gc.collect()
+
+    times_ns: list[int] = []
+    for _ in range(runs):
+        gc.collect()
+        t0 = time.perf_counter_ns()
+        fn()
+        times_ns.append(time.perf_counter_ns() - t0)
+    return times_ns
+
+
+def snapshot_run(
+    root: str,
+    *,
+    project: str = "bench",
+    max_mb: float = 0.6,
+    force_snapshot: bool = False,
+) -> Run:
+    """
+    Start a seal-free run on a local store for snapshot write benchmarks.
+    """
+    store = Store.local(root)
+    snapshot_cfg = SnapshotConfig(mode="always") if force_snapshot else SnapshotConfig(mode="auto", max_mb=max_mb)
+    rec = Recorder(
+        store=store,
+        project=project,
+        dataset="snapshot",
+        diff=DiffConfig(mode="rowhash", primary_key=["id"]),
+        snapshot=snapshot_cfg,
+        seal=SealConfig(mode="none"),
+    )
+    return rec.start_run()
+
+
+def encode_snapshot(run: Run, df: pd.DataFrame) -> bytes:
+    """
+    Parquet-encode df the way run's snapshots are, without touching the store.
+    Pair with write_snapshot_bytes() to time encode and write separately.
+    """
+    return encode_parquet(df, compression=run._parquet_compression())
+
+
+def write_snapshot_bytes(run: Run, key: str, data: bytes) -> float:
+    """
+    Store pre-encoded snapshot bytes on run's store. Returns size in MB.
+    """
+    run.store.put_bytes(key, data, content_type="application/octet-stream")
+    return float(len(data) / (1024 * 1024))
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+
+from benchmarks import run_benchmarks, run_load_tests, run_security_tests, run_stress_tests
+from benchmarks._common import global_warmup
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run every benchmark suite in one process so imports and warmup are paid once.
+    """
+    parser = argparse.ArgumentParser(description="Run all Blackbox Data benchmark suites")
+    parser.add_argument("--sizes", default=None, help="Forwarded to run_benchmarks --sizes")
+    args = parser.parse_args(argv)
+
+    global_warmup()
+    bench_argv = ["--sizes", args.sizes] if args.sizes else []
+    suites = [
+        lambda: run_benchmarks.main(bench_argv),
+        run_load_tests.main,
+        run_stress_tests.main,
+        run_security_tests.main,
+    ]
+    rc = 0
+    for suite in suites:
+        rc = max(rc, int(suite()))
+    return rc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
 import argparse
-import gc
+import itertools
 import json
 import os
-import statistics
 import tempfile
-import time
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
 
-from blackbox import Recorder, Store, DiffConfig, SnapshotConfig, SealConfig
-from blackbox.hashing import diff_rowhash, content_fingerprint_rowhash
+from blackbox import Run
+from blackbox.hashing import column_hashes, diff_rowhash, content_fingerprint_rowhash
+
+from benchmarks._common import (
+    encode_snapshot,
+    global_warmup,
+    make_df,
+    mutate_df,
+    quick_fingerprint,
+    run_timed,
+    snapshot_run,
+    write_snapshot_bytes,
+)
 
 
 @dataclass
@@ -31,21 +42,6 @@ class BenchmarkResult:
     rows_per_sec: float
 
 
-def _p95(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    vs = sorted(values)
-    idx = int(0.95 * (len(vs) - 1))
-    return float(vs[idx])
-
-
-def _time_one(fn: Callable[[], Any]) -> float:
-    t0 = time.perf_counter()
-    fn()
-    t1 = time.perf_counter()
-    return (t1 - t0) * 1000.0
-
-
 def _run_bench(
     name: str,
     n_rows: int,
@@ -56,44 +52,27 @@ def _run_bench(
     runs: int,
     rows_for_rate: int,
 ) -> BenchmarkResult:
-    for _ in range(warmup):
-        fn()
-        gc.collect()
-
-    times: list[float] = []
-    for _ in range(runs):
-        times.append(_time_one(fn))
-        gc.collect()
-
+    times_ns = run_timed(fn, runs=runs, warmup=warmup)
+    arr = np.asarray(times_ns, dtype=np.float64) / 1e6
+    mean_ms = float(arr.mean())
+    min_ms, median_ms, p95_ms, max_ms = (float(v) for v in np.percentile(arr, [0, 50, 95, 100]))
     return BenchmarkResult(
         name=name,
         n_rows=n_rows,
         n_cols=n_cols,
         runs=runs,
         warmup=warmup,
-        min_ms=min(times),
-        max_ms=max(times),
-        mean_ms=statistics.mean(times),
-        median_ms=statistics.median(times),
-        p95_ms=_p95(times),
-        rows_per_sec=(rows_for_rate / (statistics.mean(times) / 1000.0)) if statistics.mean(times) > 0 else 0.0,
-    )
-
-
-def _make_df(n: int) -> pd.DataFrame:
-    return pd.DataFrame(
-        {
-            "id": range(1, n + 1),
-            "email": [f"user{i}@example.com" for i in range(1, n + 1)],
-            "country": ["US"] * n,
-            "active": [True] * n,
-            "score": list(range(n)),
-        }
+        min_ms=min_ms,
+        max_ms=max_ms,
+        mean_ms=mean_ms,
+        median_ms=median_ms,
+        p95_ms=p95_ms,
+        rows_per_sec=(rows_for_rate / (mean_ms / 1000.0)) if mean_ms > 0 else 0.0,
     )
 
 
-def _make_wide_df(n: int, *, wide_cols: int) -> pd.DataFrame:
-    base = _make_df(n)
+def _make_wide_df(n: int, *, wide_cols: int, categorical: bool = False) -> pd.DataFrame:
+    base = make_df(n, categorical=categorical)
     if wide_cols <= 0:
         return base
     for i in range(wide_cols):
@@ -101,46 +80,31 @@ def _make_wide_df(n: int, *, wide_cols: int) -> pd.DataFrame:
     return base
 
 
-def _mutate_df(df: pd.DataFrame) -> pd.DataFrame:
-    n = len(df)
-    remove_ids = set(range(1, min(301, n + 1)))
-    change_ids = set(range(min(10_000, n), min(10_400, n)))
-    add_ids = list(range(n + 1, n + 251))
-
-    out = df[~df["id"].isin(remove_ids)].copy()
-    if change_ids:
-        out.loc[out["id"].isin(change_ids), "active"] = False
-        out.loc[out["id"].isin(change_ids), "score"] = out.loc[
-            out["id"].isin(change_ids), "score"
-        ] + 9999
-
-    add_df = pd.DataFrame(
-        {
-            "id": add_ids,
-            "email": [f"new{i}@example.com" for i in add_ids],
-            "country": ["US"] * len(add_ids),
-            "active": [True] * len(add_ids),
-            "score": [1] * len(add_ids),
-        }
-    )
-    out = pd.concat([out, add_df], ignore_index=True)
-    return out
-
-
 def _benchmarks_for_size(
-    n: int, warmup: int, runs: int, *, wide_cols: int = 0, force_snapshot: bool = False
+    n: int,
+    warmup: int,
+    runs: int,
+    *,
+    run: Run,
+    wide_cols: int = 0,
+    categorical: bool = False,
+    precompute_strings: bool = False,
 ) -> list[BenchmarkResult]:
     if wide_cols:
-        df = _make_wide_df(n, wide_cols=wide_cols)
+        df = _make_wide_df(n, wide_cols=wide_cols, categorical=categorical)
     else:
-        df = _make_df(n)
-    df2 = _mutate_df(df)
+        df = make_df(n, categorical=categorical)
+    # Built once per layout; every warmup/timed call diffs against this same df2.
+    df2 = mutate_df(df)
+    if quick_fingerprint(df) == quick_fingerprint(df2):
+        raise RuntimeError(f"mutate_df produced an unchanged frame for n={n}")
 
+    suffix = (f"_wide{wide_cols}" if wide_cols else "") + ("_cat" if categorical else "")
     results: list[BenchmarkResult] = []
 
     results.append(
         _run_bench(
-            "content_fingerprint_rowhash" + (f"_wide{wide_cols}" if wide_cols else ""),
+            "content_fingerprint_rowhash" + suffix,
             n_rows=len(df),
             n_cols=df.shape[1],
             fn=lambda: content_fingerprint_rowhash(df, order_sensitive=False, sample_rows=0),
@@ -150,9 +114,27 @@ def _benchmarks_for_size(
         )
     )
 
+    if precompute_strings:
+        # Hash the static string columns once; only the remaining columns are hashed per call.
+        str_cols = [c for c in ("email", "country") if c in df.columns]
+        precomputed = column_hashes(df, str_cols)
+        results.append(
+            _run_bench(
+                "content_fingerprint_rowhash_precomputed" + suffix,
+                n_rows=len(df),
+                n_cols=df.shape[1],
+                fn=lambda: content_fingerprint_rowhash(
+                    df, order_sensitive=False, sample_rows=0, precomputed=precomputed
+                ),
+                warmup=warmup,
+                runs=runs,
+                rows_for_rate=len(df),
+            )
+        )
+
     results.append(
         _run_bench(
-            "diff_rowhash" + (f"_wide{wide_cols}" if wide_cols else ""),
+            "diff_rowhash" + suffix,
             n_rows=len(df),
             n_cols=df.shape[1],
             fn=lambda: diff_rowhash(df, df2, primary_key=["id"], order_sensitive=False),
@@ -162,34 +144,99 @@ def _benchmarks_for_size(
         )
     )
 
-    with tempfile.TemporaryDirectory() as td:
-        store = Store.local(td)
-        snapshot_cfg = SnapshotConfig(mode="always") if force_snapshot else SnapshotConfig(mode="auto", max_mb=0.6)
-        rec = Recorder(
-            store=store,
-            project="bench",
-            dataset="snapshot",
-            diff=DiffConfig(mode="rowhash", primary_key=["id"]),
-            snapshot=snapshot_cfg,
-            seal=SealConfig(mode="none"),
+    # Each call writes a fresh key so timings exclude overwriting the previous artifact.
+    ordinals = itertools.count(1)
+    results.append(
+        _run_bench(
+            "snapshot_maybe_write_df_artifact" + suffix,
+            n_rows=len(df),
+            n_cols=df.shape[1],
+            fn=lambda: run._maybe_write_df_artifact(
+                f"steps/{next(ordinals):04d}_n{n}{suffix}/artifacts/input.bbdata", df
+            ),
+            warmup=warmup,
+            runs=runs,
+            rows_for_rate=len(df),
         )
-        run = rec.start_run()
+    )
 
-        results.append(
-            _run_bench(
-            "snapshot_maybe_write_df_artifact" + (f"_wide{wide_cols}" if wide_cols else ""),
-                n_rows=len(df),
-                n_cols=df.shape[1],
-                fn=lambda: run._maybe_write_df_artifact("steps/0001_x/artifacts/input.bbdata", df),
-                warmup=warmup,
-                runs=runs,
-                rows_for_rate=len(df),
-            )
+    # Split the fused path: Parquet encode alone (CPU), then store writes of one
+    # pre-encoded blob (IO), to see which side an optimization actually moves.
+    results.append(
+        _run_bench(
+            "snapshot_encode_only" + suffix,
+            n_rows=len(df),
+            n_cols=df.shape[1],
+            fn=lambda: encode_snapshot(run, df),
+            warmup=warmup,
+            runs=runs,
+            rows_for_rate=len(df),
         )
+    )
+    blob = encode_snapshot(run, df)
+    results.append(
+        _run_bench(
+            "snapshot_write_only" + suffix,
+            n_rows=len(df),
+            n_cols=df.shape[1],
+            fn=lambda: write_snapshot_bytes(
+                run, f"steps/{next(ordinals):04d}_n{n}{suffix}/artifacts/input.bbdata", blob
+            ),
+            warmup=warmup,
+            runs=runs,
+            rows_for_rate=len(df),
+        )
+    )
 
     return results
 
 
+def _benchmarks_for_n(
+    n: int,
+    warmup: int,
+    runs: int,
+    *,
+    run: Run,
+    wide_cols: int = 0,
+    categorical: bool = False,
+    precompute_strings: bool = False,
+) -> list[BenchmarkResult]:
+    # With categorical=True, run the object and categorical layouts side by side.
+    results: list[BenchmarkResult] = []
+    for cat in ([False, True] if categorical else [False]):
+        for width in ([0, wide_cols] if wide_cols and wide_cols > 0 else [0]):
+            results.extend(
+                _benchmarks_for_size(
+                    n,
+                    warmup=warmup,
+                    runs=runs,
+                    run=run,
+                    wide_cols=width,
+                    categorical=cat,
+                    precompute_strings=precompute_strings,
+                )
+            )
+    return results
+
+
+def _bench_size_worker(task: tuple[int, int, int, int, bool, bool, bool, str]) -> list[BenchmarkResult]:
+    """
+    Process-pool entry point: one size per worker, each with its own run.
+    """
+    n, warmup, runs, wide_cols, categorical, precompute_strings, force_snapshot, root = task
+    global_warmup()
+    run = snapshot_run(root, force_snapshot=force_snapshot)
+    return _benchmarks_for_n(
+        n,
+        warmup,
+        runs,
+        run=run,
+        wide_cols=wide_cols,
+        categorical=categorical,
+        precompute_strings=precompute_strings,
+    )
+
+
 def _print_table(results: list[BenchmarkResult]) -> None:
     headers = [
         "benchmark",
@@ -241,25 +288,25 @@ def _write_csv(path: str, results: list[BenchmarkResult]) -> None:
                 "rows_per_sec",
             ]
         )
-        for r in results:
-            writer.writerow(
-                [
-                    r.name,
-                    r.n_rows,
-                    r.n_cols,
-                    r.runs,
-                    r.warmup,
-                    f"{r.min_ms:.6f}",
-                    f"{r.max_ms:.6f}",
-                    f"{r.mean_ms:.6f}",
-                    f"{r.median_ms:.6f}",
-                    f"{r.p95_ms:.6f}",
-                    f"{r.rows_per_sec:.6f}",
-                ]
+        writer.writerows(
+            (
+                r.name,
+                r.n_rows,
+                r.n_cols,
+                r.runs,
+                r.warmup,
+                f"{r.min_ms:.6f}",
+                f"{r.max_ms:.6f}",
+                f"{r.mean_ms:.6f}",
+                f"{r.median_ms:.6f}",
+                f"{r.p95_ms:.6f}",
+                f"{r.rows_per_sec:.6f}",
             )
+            for r in results
+        )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Blackbox Data micro-benchmarks")
     parser.add_argument(
         "--sizes",
@@ -272,9 +319,25 @@ def main() -> int:
         default=0,
         help="If >0, add this many extra columns for a wide-frame benchmark",
     )
-    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--warmup", type=int, default=1, help="Per-size warmup calls (after one global warmup)")
     parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--categorical",
+        action="store_true",
+        help="Also benchmark a variant with the constant country column stored as category",
+    )
+    parser.add_argument(
+        "--precompute-strings",
+        action="store_true",
+        help="Also benchmark content fingerprints with string column hashes computed once up front",
+    )
     parser.add_argument("--force-snapshot", action="store_true", help="Force full snapshot writes (no size guard)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run sizes in parallel worker processes (1 = serial)",
+    )
     parser.add_argument(
         "--output",
         default=os.path.join("benchmarks", "results.json"),
@@ -285,24 +348,49 @@ def main() -> int:
         default=os.path.join("benchmarks", "results.csv"),
         help="Output CSV path",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     sizes = [int(s.strip()) for s in args.sizes.split(",") if s.strip()]
     all_results: list[BenchmarkResult] = []
 
-    for n in sizes:
-        all_results.extend(
-            _benchmarks_for_size(n, warmup=args.warmup, runs=args.runs, force_snapshot=args.force_snapshot)
-        )
-        if args.wide_cols and args.wide_cols > 0:
-            all_results.extend(
-                _benchmarks_for_size(
-                    n, warmup=args.warmup, runs=args.runs, wide_cols=args.wide_cols, force_snapshot=args.force_snapshot
+    with tempfile.TemporaryDirectory() as td:
+        if args.jobs > 1 and len(sizes) > 1:
+            # Sizes are independent and CPU-bound; peak memory grows with --jobs.
+            tasks = [
+                (
+                    n,
+                    args.warmup,
+                    args.runs,
+                    args.wide_cols,
+                    args.categorical,
+                    args.precompute_strings,
+                    args.force_snapshot,
+                    td,
+                )
+                for n in sizes
+            ]
+            with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+                for res in ex.map(_bench_size_worker, tasks):
+                    all_results.extend(res)
+        else:
+            global_warmup()
+            run = snapshot_run(td, force_snapshot=args.force_snapshot)
+            for n in sizes:
+                all_results.extend(
+                    _benchmarks_for_n(
+                        n,
+                        args.warmup,
+                        args.runs,
+                        run=run,
+                        wide_cols=args.wide_cols,
+                        categorical=args.categorical,
+                        precompute_strings=args.precompute_strings,
+                    )
                 )
-            )
 
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
-    payload = [asdict(r) for r in all_results]
+    # BenchmarkResult is flat, so its __dict__ serializes as-is (asdict would deep-copy).
+    payload = [r.__dict__ for r in all_results]
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
     _write_csv(args.output_csv, all_results)
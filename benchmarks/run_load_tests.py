@@ -1,14 +1,13 @@
 from __future__ import annotations
 
 import csv
+import itertools
 import os
-import time
 from dataclasses import dataclass
 
-import pandas as pd
-
 from blackbox.hashing import diff_rowhash, content_fingerprint_rowhash
-from blackbox import Recorder, Store, DiffConfig, SnapshotConfig, SealConfig
+
+from benchmarks._common import encode_snapshot, make_df, mutate_df, run_timed, snapshot_run, write_snapshot_bytes
 
 
 @dataclass
@@ -20,39 +19,9 @@ class LoadResult:
     rows_per_sec: float
 
 
-def _now_ms() -> float:
-    return time.perf_counter() * 1000.0
-
-
-def _make_df(n: int) -> pd.DataFrame:
-    return pd.DataFrame(
-        {
-            "id": range(1, n + 1),
-            "email": [f"user{i}@example.com" for i in range(1, n + 1)],
-            "country": ["US"] * n,
-            "active": [True] * n,
-            "score": list(range(n)),
-        }
-    )
-
-
-def _mutate_df(df: pd.DataFrame) -> pd.DataFrame:
-    n = len(df)
-    out = df.copy()
-    out.loc[out["id"] % 100 == 0, "active"] = False
-    out.loc[out["id"] % 100 == 0, "score"] = out.loc[out["id"] % 100 == 0, "score"] + 123
-    out = pd.concat([out, pd.DataFrame({"id": range(n + 1, n + 501), "email": ["x"] * 500, "country": ["US"] * 500, "active": [True] * 500, "score": [1] * 500})], ignore_index=True)
-    return out
-
-
 def run_load(name: str, fn, *, rows: int, iterations: int) -> LoadResult:
-    times = []
-    for _ in range(iterations):
-        t0 = _now_ms()
-        fn()
-        t1 = _now_ms()
-        times.append(t1 - t0)
-    mean_ms = sum(times) / len(times)
+    times_ns = run_timed(fn, runs=iterations)
+    mean_ms = sum(times_ns) / len(times_ns) / 1e6
     rows_per_sec = rows / (mean_ms / 1000.0) if mean_ms > 0 else 0.0
     return LoadResult(name=name, iterations=iterations, rows=rows, mean_ms=mean_ms, rows_per_sec=rows_per_sec)
 
@@ -60,8 +29,9 @@ def run_load(name: str, fn, *, rows: int, iterations: int) -> LoadResult:
 def main() -> int:
     rows = 1_000_000
     iterations = 5
-    df = _make_df(rows)
-    df2 = _mutate_df(df)
+    df = make_df(rows)
+    # Mutate once up front; timed lambdas only close over df/df2.
+    df2 = mutate_df(df, "load")
 
     results = [
         run_load(
@@ -79,16 +49,8 @@ def main() -> int:
     ]
 
     # Snapshot load: write sample to temp store repeatedly
-    store = Store.local(os.path.join("benchmarks", "load_store"))
-    rec = Recorder(
-        store=store,
-        project="load",
-        dataset="snapshot",
-        diff=DiffConfig(mode="rowhash", primary_key=["id"]),
-        snapshot=SnapshotConfig(mode="auto", max_mb=0.6),
-        seal=SealConfig(mode="none"),
-    )
-    run = rec.start_run()
+    run = snapshot_run(os.path.join("benchmarks", "load_store"), project="load")
+    # Fused path: fingerprints + size estimate + Parquet encode + store write.
     results.append(
         run_load(
             "snapshot_maybe_write_df_artifact_load",
@@ -98,13 +60,34 @@ def main() -> int:
         )
     )
 
+    # Split path: encode once (CPU-bound), then time store writes alone (IO-bound).
+    results.append(
+        run_load(
+            "snapshot_encode_df_artifact_load",
+            lambda: encode_snapshot(run, df),
+            rows=rows,
+            iterations=3,
+        )
+    )
+    blob = encode_snapshot(run, df)
+    ordinals = itertools.count(1)
+    results.append(
+        run_load(
+            "snapshot_write_bytes_load",
+            lambda: write_snapshot_bytes(run, f"steps/0002_write/artifacts/input_{next(ordinals):04d}.bbdata", blob),
+            rows=rows,
+            iterations=3,
+        )
+    )
+
     out = os.path.join("benchmarks", "load_results.csv")
     os.makedirs(os.path.dirname(out), exist_ok=True)
     with open(out, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["name", "iterations", "rows", "mean_ms", "rows_per_sec"])
-        for r in results:
-            writer.writerow([r.name, r.iterations, r.rows, f"{r.mean_ms:.2f}", f"{r.rows_per_sec:.2f}"])
+        writer.writerows(
+            (r.name, r.iterations, r.rows, f"{r.mean_ms:.2f}", f"{r.rows_per_sec:.2f}") for r in results
+        )
     print("Load test results written to:", out)
     return 0
 
@@ -56,8 +56,7 @@ def main() -> int:
     with open(out, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["name", "status", "duration_ms", "message"])
-        for r in results:
-            writer.writerow([r.name, r.status, f"{r.duration_ms:.2f}", r.message])
+        writer.writerows((r.name, r.status, f"{r.duration_ms:.2f}", r.message) for r in results)
     print("Security test results written to:", out)
     return 0
 
@@ -1,8 +1,12 @@
+from typing import TYPE_CHECKING
+
 from .config import DiffConfig, SnapshotConfig, SealConfig, RecorderConfig
-from .recorder import Recorder, Run
 from .store import Store
 from .context import record_step
 
+if TYPE_CHECKING:
+    from .recorder import Recorder, Run
+
 __all__ = [
     "Recorder", "Run",
     "Store",
@@ -10,3 +14,11 @@ __all__ = [
     "record_step",
 ]
 
+
+def __getattr__(name: str):
+    # The recorder pulls in pandas/pyarrow; load it on first use so that
+    # store-only entry points (blackbox list/verify/report) start fast.
+    if name in ("Recorder", "Run"):
+        from . import recorder
+        return getattr(recorder, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
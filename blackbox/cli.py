@@ -1,44 +1,128 @@
 from __future__ import annotations
 
 import argparse
-import json
-import datetime
+import contextlib
+import functools
+import io
 import shutil
-from typing import Any
-import subprocess
+from typing import Any, Callable, Iterator
 import os
+import sys
+import time
 
-from rich.progress import (
-    Progress,
-    SpinnerColumn,
-    BarColumn,
-    TextColumn,
-    TimeElapsedColumn,
-    TimeRemainingColumn,
-)
-
-from .store import Store
-from .config import RecorderConfig, DiffConfig, SnapshotConfig, SealConfig
-from .recorder import Recorder
-from .integrations.dbt import collect_dbt_artifacts
+# Only store/seal helpers are imported eagerly; rich, subprocess, the recorder
+# (pandas) and integrations are imported by the commands that use them.
+from .store import LocalStore, Store
 from .seal import verify_chain_with_payloads
-from .util import safe_path_component
+from .util import json_dumps_pretty as _dumps, json_dumps_pretty_bytes, safe_path_component
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
+_BSLASH_TO_SLASH = str.maketrans("\\", "/")
+
+
 def _run_prefix(project: str, dataset: str, run_id: str) -> str:
     safe_project = safe_path_component(project)
     safe_dataset = safe_path_component(dataset)
     return f"{safe_project}/{safe_dataset}/{run_id}"
 
 
-def _load_json(store: Store, key: str) -> dict[str, Any]:
-    return store.get_json(key)
+def _cache_dir(kind: str) -> str | None:
+    """
+    Where the CLI keeps its caches of kind `kind` (None disables caching).
+    BLACKBOX_CLI_CACHE=0 turns caching off; BLACKBOX_CACHE_DIR overrides the location.
+    """
+    if os.environ.get("BLACKBOX_CLI_CACHE", "1") == "0":
+        return None
+    base = os.environ.get("BLACKBOX_CACHE_DIR")
+    if not base:
+        xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg, "blackbox")
+    return os.path.join(base, kind)
+
+
+def _file_stamp(path: str) -> list[Any]:
+    # ctime cannot be set from user space, so any rewrite changes the stamp
+    # even if mtime is restored afterwards. A list, so it compares equal
+    # after a JSON round-trip through the cache.
+    st = os.stat(path)
+    return [path, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+
+def _cache_path(cache_dir: str, name: str) -> str:
+    import hashlib
+    return os.path.join(cache_dir, hashlib.sha1(name.encode("utf-8")).hexdigest() + ".json")
+
+
+def _cache_get(cache_dir: str, name: str, stamp: Any) -> tuple[bool, Any]:
+    # Plain JSON records only: the cache directory is user-writable, so
+    # nothing read from it may be able to run code (no pickle).
+    from .util import json_loads
+
+    try:
+        with open(_cache_path(cache_dir, name), "rb") as f:
+            record = json_loads(f.read())
+    except Exception:
+        return False, None
+    if not isinstance(record, dict) or record.get("stamp") != stamp:
+        return False, None
+    return True, record.get("value")
+
+
+def _cache_put(cache_dir: str, name: str, stamp: Any, obj: Any) -> None:
+    from .util import json_dumps_bytes
+
+    cache_path = _cache_path(cache_dir, name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json_dumps_bytes({"stamp": stamp, "value": obj}))
+        os.replace(tmp, cache_path)
+    except Exception:
+        pass
+
+
+def _verify_chain(store: Store, chain_obj: dict[str, Any], prefix: str) -> tuple[bool, str]:
+    """
+    verify_chain_with_payloads, optionally reusing earlier successful results.
+
+    Off unless BLACKBOX_VERIFY_CACHE=1: a cache hit trusts file stamps
+    instead of hashing payloads. The record stamps the chain head, chain.json
+    and every payload file the chain covers, so editing any of them forces a
+    full re-verification. Failures are never cached.
+    """
+    if os.environ.get("BLACKBOX_VERIFY_CACHE") != "1":
+        return verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+    cache_dir = _cache_dir("verify")
+    if cache_dir is None or not isinstance(store, LocalStore):
+        return verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+
+    chain_path = os.path.realpath(store._path(f"{prefix}/chain.json"))
+    try:
+        stamps = [chain_obj.get("head"), _file_stamp(chain_path)]
+        for e in chain_obj.get("entries", []):
+            ref = e.get("payload_ref")
+            stamps.append(_file_stamp(os.path.realpath(store._path(f"{prefix}/{ref}".replace("//", "/")))))
+    except Exception:
+        return verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+
+    hit, cached = _cache_get(cache_dir, chain_path, stamps)
+    if hit:
+        return True, cached
+
+    ok, msg = verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+    if ok:
+        _cache_put(cache_dir, chain_path, stamps, msg)
+    return ok, msg
 
 
+# Report rendering joins the same prefix with the same step-relative paths
+# many times (step.json, diff artifact candidates); both helpers are pure.
+@functools.lru_cache(maxsize=8192)
 def _join(prefix: str, rel: str) -> str:
     """Join a run prefix with a relative path safely."""
     rel = rel.lstrip("/")
@@ -80,6 +164,9 @@ def _truncate_list(values: list[Any], show: str, max_items: int) -> dict[str, An
     return out
 
 
+_TRUNCATED_PAYLOAD_KEYS = ("added_keys", "removed_keys", "changed_keys", "added_rowhashes", "removed_rowhashes")
+
+
 def _truncate_payload_lists(payload: dict[str, Any], *, show: str, max_items: int) -> dict[str, Any]:
     """
     Truncate the big lists that explode report output.
@@ -87,11 +174,73 @@ def _truncate_payload_lists(payload: dict[str, Any], *, show: str, max_items: in
       - added_keys / removed_keys / changed_keys
       - added_rowhashes / removed_rowhashes
     """
-    out = dict(payload)
-    for k in ("added_keys", "removed_keys", "changed_keys", "added_rowhashes", "removed_rowhashes"):
-        if isinstance(out.get(k), list):
-            out[k] = _truncate_list(out[k], show=show, max_items=max_items)
-    return out
+    overrides = {
+        k: _truncate_list(v, show=show, max_items=max_items)
+        for k in _TRUNCATED_PAYLOAD_KEYS
+        if isinstance(v := payload.get(k), list)
+    }
+    # Nothing to truncate (e.g. already truncated at load time): no copy.
+    if not overrides:
+        return payload
+    return {**payload, **overrides}
+
+def _stdout_buffer() -> Any:
+    # Flush pending text first so byte writes land after earlier print() output.
+    sys.stdout.flush()
+    return getattr(sys.stdout, "buffer", None)
+
+
+def _write_json(obj: Any) -> None:
+    """
+    Print indented, key-sorted JSON, writing the encoded bytes straight to stdout.
+    """
+    data = json_dumps_pretty_bytes(obj)
+    out = _stdout_buffer()
+    if out is None:
+        print(data.decode("utf-8"))
+        return
+    out.write(data + b"\n")
+    out.flush()
+
+
+def _write_json_streamed(head: dict[str, Any], arrays: dict[str, list[Any]]) -> None:
+    """
+    Write head plus arrays as one JSON object, encoding array items one at a
+    time so no single buffer holds the whole document. Keys in head are
+    sorted; arrays follow them in the given order.
+    """
+    out = _stdout_buffer()
+    write = out.write if out is not None else (lambda b: sys.stdout.write(b.decode("utf-8")))
+
+    body = json_dumps_pretty_bytes(head)
+    write(body[: body.rindex(b"}")].rstrip())
+    sep = b",\n" if head else b"\n"
+    for name, items in arrays.items():
+        write(sep + b"  " + json_dumps_pretty_bytes(name) + b": [")
+        for j, item in enumerate(items):
+            chunk = json_dumps_pretty_bytes(item).replace(b"\n", b"\n    ")
+            write((b"\n    " if j == 0 else b",\n    ") + chunk)
+        write(b"\n  ]" if items else b"]")
+        sep = b",\n"
+    write(b"\n}\n")
+    if out is not None:
+        out.flush()
+
+
+@contextlib.contextmanager
+def _buffered_stdout() -> Iterator[None]:
+    """
+    Collect print() output in memory and emit it with one write on exit,
+    instead of one write (and, on a terminal, one flush) per line.
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
 
 def _print_section(title: str) -> None:
     print()
@@ -100,27 +249,34 @@ def _print_section(title: str) -> None:
 def _print_kv(label: str, value: Any) -> None:
     print(f"{label:16s} {value}")
 
-def _load_step_object(store: Store, prefix: str, st: dict[str, Any]) -> dict[str, Any] | None:
+def _load_step_objects(store: Store, prefix: str, steps_index: list[Any]) -> list[dict[str, Any] | None]:
     """
+    Resolve every run.json['steps'] entry to its step payload, in order.
+
     Supports both:
-    - run.json['steps'] entries that are already full step payloads (contain 'code'/'input' etc)
-    - run.json['steps'] entries that are references (contain 'path')
+    - entries that are already full step payloads (contain 'code'/'input' etc)
+    - entries that are references (contain 'path'); these are fetched in one batch
     """
-    # Already a full step payload?
-    if any(k in st for k in ("code", "input", "output", "diff", "schema_diff")) and "path" not in st:
-        return st
-
-    path = st.get("path")
-    if not path:
-        return None
+    out: list[dict[str, Any] | None] = [None] * len(steps_index)
+    pending: list[tuple[int, str]] = []
+    for idx, st in enumerate(steps_index):
+        if not isinstance(st, dict):
+            continue
+        # Already a full step payload?
+        if any(k in st for k in ("code", "input", "output", "diff", "schema_diff")) and "path" not in st:
+            out[idx] = st
+            continue
+        path = st.get("path")
+        if path:
+            pending.append((idx, _join(prefix, path)))
 
-    step_key = _join(prefix, path)
-    try:
-        return store.get_json(step_key)
-    except FileNotFoundError:
-        return None
+    fetched = store.get_json_many([k for _, k in pending])
+    for (idx, _), obj in zip(pending, fetched):
+        out[idx] = obj
+    return out
 
 
+@functools.lru_cache(maxsize=8192)
 def _infer_step_dir_from_path(path: str) -> str:
     """
     path looks like:
@@ -128,96 +284,109 @@ def _infer_step_dir_from_path(path: str) -> str:
     so step_dir becomes:
       steps/0001_name
     """
-    parts = path.replace("\\", "/").split("/")
+    parts = path.translate(_BSLASH_TO_SLASH).split("/")
     if len(parts) >= 2:
         return "/".join(parts[:-1])
     return ""
 
 
-def _load_diff_payload_for_step(
-    store: Store, prefix: str, step_obj: dict[str, Any], step_path: str | None
-) -> dict[str, Any] | None:
+def _load_diff_payloads(
+    store: Store,
+    prefix: str,
+    steps: list[tuple[dict[str, Any], str | None]],
+    *,
+    transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> list[dict[str, Any] | None]:
     """
+    Resolve the diff payload for each (step_obj, step_path), in order.
+
     Supports:
     - step_obj['diff_payload'] embedded (older debug mode)
     - step_obj['diff']['artifact'] relative to the step folder (current format)
+
+    All candidate artifact keys are fetched in one batch; the first one found wins.
+    transform, if given, is applied to each fetched artifact as it is parsed.
     """
-    if isinstance(step_obj.get("diff_payload"), dict):
-        return step_obj["diff_payload"]
+    out: list[dict[str, Any] | None] = [None] * len(steps)
+    candidates: list[tuple[int, str]] = []
+    for idx, (step_obj, step_path) in enumerate(steps):
+        if isinstance(step_obj.get("diff_payload"), dict):
+            out[idx] = step_obj["diff_payload"]
+            continue
 
-    diff = step_obj.get("diff")
-    if not isinstance(diff, dict):
-        return None
+        diff = step_obj.get("diff")
+        if not isinstance(diff, dict):
+            continue
 
-    artifact = diff.get("artifact")
-    if not isinstance(artifact, str) or not artifact:
-        return None
+        artifact = diff.get("artifact")
+        if not isinstance(artifact, str) or not artifact:
+            continue
 
-    candidate_keys: list[str] = []
+        if step_path:
+            step_dir = _infer_step_dir_from_path(step_path)
+            candidates.append((idx, _join(prefix, f"{step_dir}/{artifact}")))
 
-    if step_path:
-        step_dir = _infer_step_dir_from_path(step_path)
-        candidate_keys.append(_join(prefix, f"{step_dir}/{artifact}"))
+        # fallback guess (covers some earlier layouts)
+        candidates.append((idx, _join(prefix, artifact)))
 
-    # fallback guess (covers some earlier layouts)
-    candidate_keys.append(_join(prefix, artifact))
+    fetched = store.get_json_many([k for _, k in candidates], transform=transform)
+    for (idx, _), obj in zip(candidates, fetched):
+        if out[idx] is None and obj is not None:
+            out[idx] = obj
+    return out
 
-    for k in candidate_keys:
-        try:
-            return store.get_json(k)
-        except FileNotFoundError:
-            continue
 
-    return None
+def _compact_io_summary(d: dict[str, Any]) -> dict[str, Any]:
+    get = d.get
+    return {
+        "rows": get("n_rows", get("rows")),
+        "cols": get("n_cols", get("cols")),
+        "artifact": get("artifact"),
+        "sample_artifact": get("sample_artifact"),
+        "skip": get("snapshot_skipped", get("skip")),
+    }
 
 
-def _compact_step_summary(step_obj: dict[str, Any]) -> dict[str, Any]:
+def _compact_step_summary(step_obj: dict[str, Any], *, include_diff: bool = True) -> dict[str, Any]:
     """
     Produce a concise, readable summary per step (default output).
+    include_diff=False leaves out the diff block (schema-only rendering)
+    instead of building it for the caller to drop.
     """
+    get = step_obj.get
     out: dict[str, Any] = {
-        "ordinal": step_obj.get("ordinal"),
-        "name": step_obj.get("name"),
-        "status": step_obj.get("status"),
-        "started_at": step_obj.get("started_at"),
-        "finished_at": step_obj.get("finished_at"),
+        "ordinal": get("ordinal"),
+        "name": get("name"),
+        "status": get("status"),
+        "started_at": get("started_at"),
+        "finished_at": get("finished_at"),
     }
 
-    inp = step_obj.get("input")
-    outp = step_obj.get("output")
+    inp = get("input")
     if isinstance(inp, dict):
-        out["input"] = {
-            "rows": inp.get("n_rows", inp.get("rows")),
-            "cols": inp.get("n_cols", inp.get("cols")),
-            "artifact": inp.get("artifact"),
-            "sample_artifact": inp.get("sample_artifact"),
-            "skip": inp.get("snapshot_skipped", inp.get("skip")),
-        }
+        out["input"] = _compact_io_summary(inp)
+    outp = get("output")
     if isinstance(outp, dict):
-        out["output"] = {
-            "rows": outp.get("n_rows", outp.get("rows")),
-            "cols": outp.get("n_cols", outp.get("cols")),
-            "artifact": outp.get("artifact"),
-            "sample_artifact": outp.get("sample_artifact"),
-            "skip": outp.get("snapshot_skipped", outp.get("skip")),
-        }
+        out["output"] = _compact_io_summary(outp)
 
-    if isinstance(step_obj.get("schema_diff"), dict):
-        out["schema_diff"] = step_obj["schema_diff"]
+    schema_diff = get("schema_diff")
+    if isinstance(schema_diff, dict):
+        out["schema_diff"] = schema_diff
 
-    if isinstance(step_obj.get("diff"), dict):
-        d = step_obj["diff"]
-        summary = d.get("summary") if isinstance(d.get("summary"), dict) else None
+    d = get("diff")
+    if include_diff and isinstance(d, dict):
+        summary = d.get("summary")
         out["diff"] = {
             "mode": d.get("mode"),
-            "summary": summary,
+            "summary": summary if isinstance(summary, dict) else None,
             "artifact": d.get("artifact"),
             "summary_only": d.get("summary_only"),
             "ui_hint": d.get("ui_hint"),
         }
 
-    if isinstance(step_obj.get("evidence"), dict):
-        out["evidence"] = step_obj["evidence"]
+    evidence = get("evidence")
+    if isinstance(evidence, dict):
+        out["evidence"] = evidence
 
     return out
 
@@ -244,17 +413,11 @@ def cmd_list(args: argparse.Namespace) -> int:
         except Exception:
             keys = store.list(f"{base}/")
 
-        run_set: set[str] = set()
-        for k in keys:
-            k = str(k).lstrip("/")
-            if not k.startswith(base + "/"):
-                continue
-            rest = k[len(base) + 1 :]
-            if not rest:
-                continue
-            rid = rest.split("/", 1)[0]
-            if rid:
-                run_set.add(rid)
+        base_slash = base + "/"
+        n = len(base_slash)
+        stripped = (str(k).lstrip("/") for k in keys)
+        run_set = {k[n:].split("/", 1)[0] for k in stripped if k.startswith(base_slash)}
+        run_set.discard("")
         run_ids = sorted(run_set)
 
     if run_ids:
@@ -272,7 +435,7 @@ def cmd_verify(args: argparse.Namespace) -> int:
     prefix = _run_prefix(args.project, args.dataset, args.run_id)
 
     try:
-        run_obj = _load_json(store, f"{prefix}/run.json")
+        run_obj = store.get_json(f"{prefix}/run.json")
     except FileNotFoundError:
         payload = {
             "ok": False,
@@ -282,7 +445,7 @@ def cmd_verify(args: argparse.Namespace) -> int:
             "hint": f"blackbox --root {args.root} list --project {args.project} --dataset {args.dataset}",
         }
         if args.json:
-            print(json.dumps(payload, indent=2, sort_keys=True))
+            _write_json(payload)
         else:
             print("FAIL: run not found.")
             print("root:", args.root)
@@ -302,13 +465,13 @@ def cmd_verify(args: argparse.Namespace) -> int:
             "chain_head": None,
         }
         if args.json:
-            print(json.dumps(payload, indent=2, sort_keys=True))
+            _write_json(payload)
         else:
             print("OK: seal disabled.")
         return 0
 
     try:
-        chain_obj = _load_json(store, f"{prefix}/chain.json")
+        chain_obj = store.get_json(f"{prefix}/chain.json")
     except FileNotFoundError:
         payload = {
             "ok": False,
@@ -317,14 +480,14 @@ def cmd_verify(args: argparse.Namespace) -> int:
             "prefix": prefix,
         }
         if args.json:
-            print(json.dumps(payload, indent=2, sort_keys=True))
+            _write_json(payload)
         else:
             print("FAIL: chain.json not found.")
             print("root:", args.root)
             print("prefix:", prefix)
         return 2
 
-    ok, msg = verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+    ok, msg = _verify_chain(store, chain_obj, prefix)
 
     payload = {
         "ok": bool(ok),
@@ -336,21 +499,25 @@ def cmd_verify(args: argparse.Namespace) -> int:
     }
 
     if args.json:
-        print(json.dumps(payload, indent=2, sort_keys=True))
+        _write_json(payload)
     else:
-        _print_section("Verify")
-        _print_kv("result", "OK" if ok else "FAIL")
-        _print_kv("message", msg)
+        with _buffered_stdout():
+            _print_section("Verify")
+            _print_kv("result", "OK" if ok else "FAIL")
+            _print_kv("message", msg)
 
     return 0 if ok else 1
 
 
 def cmd_report(args: argparse.Namespace) -> int:
+    if args.stream_json:
+        # Same document as --json; only the way it is written differs.
+        args.json = True
     store = Store.local(args.root)
     prefix = _run_prefix(args.project, args.dataset, args.run_id)
 
     try:
-        run_obj = _load_json(store, f"{prefix}/run.json")
+        run_obj = store.get_json(f"{prefix}/run.json")
     except FileNotFoundError:
         payload = {
             "ok": False,
@@ -360,7 +527,7 @@ def cmd_report(args: argparse.Namespace) -> int:
             "hint": f"blackbox --root {args.root} list --project {args.project} --dataset {args.dataset}",
         }
         if args.json:
-            print(json.dumps(payload, indent=2, sort_keys=True))
+            _write_json(payload)
         else:
             print("Run not found.")
             print("root:", args.root)
@@ -373,7 +540,7 @@ def cmd_report(args: argparse.Namespace) -> int:
     chain_obj: dict[str, Any] | None = None
     if seal_mode != "none":
         try:
-            chain_obj = _load_json(store, f"{prefix}/chain.json")
+            chain_obj = store.get_json(f"{prefix}/chain.json")
         except FileNotFoundError:
             payload = {
                 "ok": False,
@@ -382,7 +549,7 @@ def cmd_report(args: argparse.Namespace) -> int:
                 "prefix": prefix,
             }
             if args.json:
-                print(json.dumps(payload, indent=2, sort_keys=True))
+                _write_json(payload)
             else:
                 print("Run found, but chain.json missing.")
                 print("root:", args.root)
@@ -392,40 +559,53 @@ def cmd_report(args: argparse.Namespace) -> int:
     if chain_obj is None:
         ok, msg = True, "seal disabled"
     else:
-        ok, msg = verify_chain_with_payloads(chain_obj, store, run_prefix=prefix)
+        ok, msg = _verify_chain(store, chain_obj, prefix)
 
     steps_index = run_obj.get("steps", [])
     total_steps = len(steps_index)
 
-    step_summaries: list[dict[str, Any]] = []
-    verbose_steps: list[dict[str, Any]] = []
-
     # Progress bar is only meaningful for human output; JSON output should be clean.
     use_progress = (not args.json) and total_steps > 0
 
-    def _process_one_step(i: int, st: Any) -> None:
-        step_path = st.get("path") if isinstance(st, dict) else None
-        step_obj = _load_step_object(store, prefix, st) if isinstance(st, dict) else None
+    # Batch the per-step reads up front: step.json files, then diff artifacts.
+    step_objs = _load_step_objects(store, prefix, steps_index)
+    diff_payloads: dict[int, dict[str, Any] | None] = {}
+    if args.verbose and args.diff_mode != "schema":
+        loaded = [
+            (idx, obj, st.get("path"))
+            for idx, (st, obj) in enumerate(zip(steps_index, step_objs))
+            if obj is not None
+        ]
+        diff_payloads = dict(
+            zip(
+                (idx for idx, _, _ in loaded),
+                _load_diff_payloads(
+                    store,
+                    prefix,
+                    [(obj, path) for _, obj, path in loaded],
+                    # Truncate key lists as each artifact is parsed so the full
+                    # lists are dropped per step, not held for the whole report.
+                    transform=lambda p: _truncate_payload_lists(p, show=args.show_keys, max_items=args.max_keys),
+                ),
+            )
+        )
+
+    def _process_one_step(i: int, st: Any) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        step_obj = step_objs[i - 1]
 
         if step_obj is None:
-            step_summaries.append(
-                {
-                    "ordinal": i,
-                    "name": st.get("name") if isinstance(st, dict) else None,
-                    "status": "missing_step_json",
-                }
-            )
-            return
+            missing = {
+                "ordinal": i,
+                "name": st.get("name") if isinstance(st, dict) else None,
+                "status": "missing_step_json",
+            }
+            return missing, None
 
-        summary = _compact_step_summary(step_obj)
-        if args.diff_mode == "schema":
-            summary.pop("diff", None)
-        step_summaries.append(summary)
+        summary = _compact_step_summary(step_obj, include_diff=args.diff_mode != "schema")
 
+        verbose_entry: dict[str, Any] | None = None
         if args.verbose:
-            diff_payload = None
-            if args.diff_mode != "schema":
-                diff_payload = _load_diff_payload_for_step(store, prefix, step_obj, step_path)
+            diff_payload = diff_payloads.get(i - 1)
             if isinstance(diff_payload, dict):
                 if args.diff_mode == "keys-only":
                     diff_payload["added_keys"] = []
@@ -452,20 +632,32 @@ def cmd_report(args: argparse.Namespace) -> int:
                         diff_payload["changed_keys"] = []
                 diff_payload = _truncate_payload_lists(diff_payload, show=args.show_keys, max_items=args.max_keys)
 
-            verbose_steps.append(
-                {
-                    "step": summary,
-                    "code": step_obj.get("code"),
-                    "raw_input": step_obj.get("input"),
-                    "raw_output": step_obj.get("output"),
-                    "raw_schema_diff": step_obj.get("schema_diff"),
-                    "raw_diff": step_obj.get("diff"),
-                    "raw_evidence": step_obj.get("evidence"),
-                    "diff_payload": diff_payload,
-                }
-            )
+            verbose_entry = {
+                "step": summary,
+                "code": step_obj.get("code"),
+                "raw_input": step_obj.get("input"),
+                "raw_output": step_obj.get("output"),
+                "raw_schema_diff": step_obj.get("schema_diff"),
+                "raw_diff": step_obj.get("diff"),
+                "raw_evidence": step_obj.get("evidence"),
+                "diff_payload": diff_payload,
+            }
+        return summary, verbose_entry
+
+    # I/O already happened in the batched fetches above, so this loop is pure
+    # CPU work; results go into pre-sized slots to keep step order.
+    results: list[tuple[dict[str, Any], dict[str, Any] | None] | None] = [None] * total_steps
 
     if use_progress:
+        from rich.progress import (
+            Progress,
+            SpinnerColumn,
+            BarColumn,
+            TextColumn,
+            TimeElapsedColumn,
+            TimeRemainingColumn,
+        )
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -477,11 +669,14 @@ def cmd_report(args: argparse.Namespace) -> int:
         ) as prog:
             task = prog.add_task("Rendering report", total=total_steps)
             for i, st in enumerate(steps_index, start=1):
-                _process_one_step(i, st)
+                results[i - 1] = _process_one_step(i, st)
                 prog.advance(task, 1)
     else:
         for i, st in enumerate(steps_index, start=1):
-            _process_one_step(i, st)
+            results[i - 1] = _process_one_step(i, st)
+
+    step_summaries = [r[0] for r in results if r is not None]
+    verbose_steps = [r[1] for r in results if r is not None and r[1] is not None]
 
     report_obj: dict[str, Any] = {
         "ok": bool(ok),
@@ -507,114 +702,166 @@ def cmd_report(args: argparse.Namespace) -> int:
     if args.verbose:
         report_obj["verbose_steps"] = verbose_steps
 
-    if args.json:
-        print(json.dumps(report_obj, indent=2, sort_keys=True))
+    if args.stream_json:
+        arrays = {"steps": report_obj.pop("steps")}
+        if args.verbose:
+            arrays["verbose_steps"] = report_obj.pop("verbose_steps")
+        _write_json_streamed(report_obj, arrays)
         return 0 if ok else 1
 
-    # Human-friendly output
-    _print_section("Run")
-    _print_kv("root", args.root)
-    _print_kv("prefix", prefix)
-    _print_kv("project", args.project)
-    _print_kv("dataset", args.dataset)
-    _print_kv("run_id", args.run_id)
-    _print_kv("status", run_obj.get("status"))
-    _print_kv("created_at", run_obj.get("created_at"))
-    _print_kv("finished_at", run_obj.get("finished_at"))
-    _print_kv("verify", f"{ok} ({msg})")
-    _print_kv("chain_entries", len(chain_obj.get("entries", [])) if chain_obj else 0)
-    _print_kv("chain_head", chain_obj.get("head") if chain_obj else None)
-
-    for idx, s in enumerate(step_summaries, start=1):
-        name = s.get("name", f"step_{idx}")
-        status = s.get("status", "ok")
-        _print_section(f"Step {idx} · {name} [{status}]")
-
-        inp = s.get("input")
-        outp = s.get("output")
-        if isinstance(inp, dict):
-            _print_kv(
-                "input",
-                f"rows={inp.get('rows')} cols={inp.get('cols')} artifact={inp.get('artifact') or inp.get('sample_artifact') or None}",
-            )
-            if inp.get("skip"):
-                _print_kv("input_skip", inp["skip"])
-        if isinstance(outp, dict):
-            _print_kv(
-                "output",
-                f"rows={outp.get('rows')} cols={outp.get('cols')} artifact={outp.get('artifact') or outp.get('sample_artifact') or None}",
-            )
-            if outp.get("skip"):
-                _print_kv("output_skip", outp["skip"])
+    if args.json:
+        _write_json(report_obj)
+        return 0 if ok else 1
 
-        if isinstance(s.get("schema_diff"), dict):
-            _print_kv("schema_diff", s["schema_diff"])
+    # Human-friendly output, rendered into one buffer and written once.
+    with _buffered_stdout():
+        _print_section("Run")
+        _print_kv("root", args.root)
+        _print_kv("prefix", prefix)
+        _print_kv("project", args.project)
+        _print_kv("dataset", args.dataset)
+        _print_kv("run_id", args.run_id)
+        _print_kv("status", run_obj.get("status"))
+        _print_kv("created_at", run_obj.get("created_at"))
+        _print_kv("finished_at", run_obj.get("finished_at"))
+        _print_kv("verify", f"{ok} ({msg})")
+        _print_kv("chain_entries", len(chain_obj.get("entries", [])) if chain_obj else 0)
+        _print_kv("chain_head", chain_obj.get("head") if chain_obj else None)
+
+        for idx, s in enumerate(step_summaries, start=1):
+            name = s.get("name", f"step_{idx}")
+            status = s.get("status", "ok")
+            _print_section(f"Step {idx} · {name} [{status}]")
+
+            inp = s.get("input")
+            outp = s.get("output")
+            if isinstance(inp, dict):
+                _print_kv(
+                    "input",
+                    f"rows={inp.get('rows')} cols={inp.get('cols')} artifact={inp.get('artifact') or inp.get('sample_artifact') or None}",
+                )
+                if inp.get("skip"):
+                    _print_kv("input_skip", inp["skip"])
+            if isinstance(outp, dict):
+                _print_kv(
+                    "output",
+                    f"rows={outp.get('rows')} cols={outp.get('cols')} artifact={outp.get('artifact') or outp.get('sample_artifact') or None}",
+                )
+                if outp.get("skip"):
+                    _print_kv("output_skip", outp["skip"])
+
+            if isinstance(s.get("schema_diff"), dict):
+                _print_kv("schema_diff", s["schema_diff"])
+
+            diff = s.get("diff")
+            if isinstance(diff, dict):
+                _print_kv("diff", diff.get("summary") or diff)
+                if diff.get("ui_hint"):
+                    _print_kv("diff_hint", diff.get("ui_hint"))
+
+            if args.verbose:
+                v = verbose_steps[idx - 1] if (idx - 1) < len(verbose_steps) else None
+                if v:
+                    if v.get("code"):
+                        _print_kv("code", v["code"])
+                    if v.get("raw_evidence"):
+                        _print_kv("evidence", v["raw_evidence"])
+                    if v.get("diff_payload"):
+                        # Helpful MVP note: make schema-only changes explicit
+                        notes = v["diff_payload"].get("notes") if isinstance(v["diff_payload"], dict) else None
+                        if isinstance(notes, dict) and notes.get("schema_changed"):
+                            left = notes.get("cols_only_in_left") or []
+                            right = notes.get("cols_only_in_right") or []
+                            _print_kv("diff_notes", {"only_in_left": left, "only_in_right": right})
+                        _print_kv("diff_payload", _dumps(v["diff_payload"]))
 
-        diff = s.get("diff")
-        if isinstance(diff, dict):
-            _print_kv("diff", diff.get("summary") or diff)
-            if diff.get("ui_hint"):
-                _print_kv("diff_hint", diff.get("ui_hint"))
+    return 0 if ok else 1
 
-        if args.verbose:
-            v = verbose_steps[idx - 1] if (idx - 1) < len(verbose_steps) else None
-            if v:
-                if v.get("code"):
-                    _print_kv("code", v["code"])
-                if v.get("raw_evidence"):
-                    _print_kv("evidence", v["raw_evidence"])
-                if v.get("diff_payload"):
-                    # Helpful MVP note: make schema-only changes explicit
-                    notes = v["diff_payload"].get("notes") if isinstance(v["diff_payload"], dict) else None
-                    if isinstance(notes, dict) and notes.get("schema_changed"):
-                        left = notes.get("cols_only_in_left") or []
-                        right = notes.get("cols_only_in_right") or []
-                        _print_kv("diff_notes", {"only_in_left": left, "only_in_right": right})
-                    _print_kv("diff_payload", json.dumps(v["diff_payload"], indent=2, sort_keys=True))
 
-    return 0 if ok else 1
+def _scan_dirs(path: str) -> list[os.DirEntry]:
+    """Immediate subdirectories of path, sorted by name ([] if unreadable)."""
+    try:
+        with os.scandir(path) as it:
+            entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
 
 
 def cmd_cleanup(args: argparse.Namespace) -> int:
+    import datetime
+
     store = Store.local(args.root)
     retention_days = float(args.retention_days)
-    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=retention_days)
-    removed = 0
-    kept = 0
-    projects = store.list_dirs("")
-    for project in projects:
-        datasets = store.list_dirs(project)
-        for dataset in datasets:
-            runs = store.list_dirs(f"{project}/{dataset}")
-            for run_id in runs:
-                run_key = f"{project}/{dataset}/{run_id}/run.json"
+    # One integer epoch cutoff; run.json mtimes are compared against it directly.
+    cutoff_ns = time.time_ns() - int(retention_days * 86_400 * 1_000_000_000)
+    cutoff = datetime.datetime.fromtimestamp(cutoff_ns / 1_000_000_000, tz=datetime.timezone.utc)
+
+    run_paths: list[str] = []
+    expired: list[bool] = []
+    for project in _scan_dirs(store._path("")):
+        for dataset in _scan_dirs(project.path):
+            for run_dir in _scan_dirs(dataset.path):
+                # Runs whose run.json is missing or corrupt are skipped and
+                # runs without a (parseable) timestamp are kept, never deleted.
                 try:
-                    run_obj = store.get_json(run_key)
+                    run_obj = store.get_json(f"{project.name}/{dataset.name}/{run_dir.name}/run.json")
+                    mtime_ns = os.stat(os.path.join(run_dir.path, "run.json")).st_mtime_ns
                 except Exception:
                     continue
                 created_at = run_obj.get("created_at") or run_obj.get("finished_at")
+                run_paths.append(run_dir.path)
                 if not created_at:
-                    kept += 1
+                    expired.append(False)
                     continue
+                # "Z" is spelled out for Python 3.10's fromisoformat; naive
+                # values are read as UTC. No pandas import just to compare dates.
                 try:
-                    ts = str(created_at).replace("Z", "+00:00")
-                    dt = datetime.datetime.fromisoformat(ts)
-                except Exception:
-                    kept += 1
+                    dt = datetime.datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+                except ValueError:
+                    expired.append(False)
+                    continue
+                if mtime_ns < cutoff_ns:
+                    # run.json is last rewritten at finish, after created_at, so
+                    # an old mtime settles it (this only skips the comparison).
+                    expired.append(True)
                     continue
-                if dt < cutoff:
-                    path = store._path(f"{project}/{dataset}/{run_id}")
-                    if args.dry_run:
-                        print("DRY RUN remove", path)
-                    else:
-                        shutil.rmtree(path, ignore_errors=True)
-                    removed += 1
-                else:
-                    kept += 1
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=datetime.timezone.utc)
+                expired.append(dt < cutoff)
+
+    removed = 0
+    kept = 0
+    for path, is_expired in zip(run_paths, expired):
+        if is_expired:
+            if args.dry_run:
+                print("DRY RUN remove", path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        else:
+            kept += 1
     print(f"cleanup complete: removed={removed} kept={kept}")
     return 0
 
 
+def _copy_pipe_to_store(pipe: Any, store: Store, key: str, *, chunk_size: int = 64 * 1024) -> bool:
+    """
+    Copy a child process pipe into store key chunk by chunk.
+    Returns False (and writes nothing) if the pipe produced no output.
+    """
+    with pipe:
+        chunk = pipe.read1(chunk_size)
+        if not chunk:
+            return False
+        with store.open_writer(key) as out:
+            while chunk:
+                out.write(chunk)
+                chunk = pipe.read1(chunk_size)
+    return True
+
+
 def cmd_wrap(args: argparse.Namespace) -> int:
     cmd = list(args.cmd or [])
     if cmd and cmd[0] == "--":
@@ -623,6 +870,13 @@ def cmd_wrap(args: argparse.Namespace) -> int:
         print("ERROR: wrap requires a command. Example: blackbox --root ./.blackbox_store wrap --project p --dataset d -- python pipeline.py")
         return 2
 
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .config import RecorderConfig, DiffConfig, SnapshotConfig, SealConfig
+    from .integrations.dbt import copy_dbt_artifacts
+    from .recorder import Recorder
+
     store = Store.local(args.root)
     rec = Recorder(
         store=store,
@@ -636,35 +890,33 @@ def cmd_wrap(args: argparse.Namespace) -> int:
     run = rec.start_run(run_id=args.run_id, tags={"source": "wrap"})
 
     with run.step(args.name) as st:
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        stdout = proc.stdout or ""
-        stderr = proc.stderr or ""
-        exit_code = int(proc.returncode)
-
         step_key = run._step_prefix(1, args.name)
         artifacts_prefix = f"{step_key}/artifacts"
-        if stdout:
-            store.put_bytes(f"{artifacts_prefix}/stdout.txt", stdout.encode("utf-8"))
-        if stderr:
-            store.put_bytes(f"{artifacts_prefix}/stderr.txt", stderr.encode("utf-8"))
 
-        dbt_artifacts = collect_dbt_artifacts(os.getcwd())
-        for name, payload in dbt_artifacts.items():
-            store.put_bytes(f"{artifacts_prefix}/{name}", payload)
+        # Stream both pipes into the store as the child runs; stderr is drained
+        # on a thread so neither pipe can fill up and block the child.
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            stderr_fut = ex.submit(_copy_pipe_to_store, proc.stderr, store, f"{artifacts_prefix}/stderr.txt")
+            stdout = _copy_pipe_to_store(proc.stdout, store, f"{artifacts_prefix}/stdout.txt")
+            stderr = stderr_fut.result()
+        exit_code = int(proc.wait())
+
+        dbt_artifacts = copy_dbt_artifacts(os.getcwd(), store, artifacts_prefix)
 
         st.add_metadata(
             command=" ".join(cmd),
             exit_code=exit_code,
             stdout_artifact=f"{artifacts_prefix}/stdout.txt" if stdout else None,
             stderr_artifact=f"{artifacts_prefix}/stderr.txt" if stderr else None,
-            dbt_artifacts=list(dbt_artifacts.keys()) if dbt_artifacts else [],
+            dbt_artifacts=dbt_artifacts,
         )
 
     run.finish()
     ok, msg = run.verify()
     print(f"run_id: {run.run_id}")
     print(f"verify: {ok} {msg}")
-    return 0 if proc.returncode == 0 else proc.returncode
+    return 0 if exit_code == 0 else exit_code
 
 
 # -----------------------------
@@ -695,6 +947,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_report.add_argument("--run-id", required=True)
     p_report.add_argument("-v", "--verbose", action="store_true", help="Include step details and diff payload (truncated)")
     p_report.add_argument("--json", action="store_true", help="Machine-readable JSON output")
+    p_report.add_argument(
+        "--stream-json",
+        action="store_true",
+        help="Like --json, but writes steps one at a time (lower peak memory on large verbose runs)",
+    )
     p_report.add_argument(
         "--show-keys",
         choices=["none", "head", "headtail", "all"],
@@ -737,14 +994,20 @@ def build_parser() -> argparse.ArgumentParser:
     return p
 
 
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    # Built once per process; main() may be called repeatedly when embedded.
+    return build_parser()
+
+
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    parser = _get_parser()
     args = parser.parse_args(argv)
     try:
         return int(args.func(args))
     except Exception as e:
         if getattr(args, "json", False):
-            print(json.dumps({"ok": False, "error": "unexpected_exception", "message": str(e)}, indent=2, sort_keys=True))
+            _write_json({"ok": False, "error": "unexpected_exception", "message": str(e)})
         else:
             print("ERROR:", e)
         return 3
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Literal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiffConfig:
     mode: Literal["none", "rowhash"] = "rowhash"
     diff_mode: Literal["rows", "schema", "keys-only"] = "rows"
@@ -27,13 +27,19 @@ class DiffConfig:
     auto_parallel_threshold_cols: int = 80
     auto_parallel_workers: int = 4
     auto_hash_group_size: int = 8
+    # Opt-in: on the auto path, hash in forked processes once rows * cols
+    # reaches this. 0 (default) never forks; fork is also skipped on macOS
+    # and whenever other threads are running.
+    auto_parallel_process_cells: int = 0
     # Cache rowhashes in-memory (weakref) for reuse within a run.
     cache_rowhash: bool = True
     # Experimental: use native Polars hashing when inputs are Polars DataFrames.
     native_polars: bool = False
+    # Trust that primary keys are unique and skip the duplicate-key checks.
+    pk_is_unique: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SnapshotConfig:
     """
     Snapshot policy:
@@ -57,13 +63,13 @@ class SnapshotConfig:
     sample_cols: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SealConfig:
     mode: Literal["none", "chain"] = "chain"
     algo: Literal["sha256"] = "sha256"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RecorderConfig:
     # v0.1: keep explicit; no magic inference
     enforce_explicit_output: bool = True
@@ -73,6 +79,9 @@ class RecorderConfig:
     # Async snapshot writes (waited at run.finish).
     snapshot_async: bool = False
     snapshot_async_workers: int = 2
+    # Write step/diff/chain JSON from a background thread (drained at run.finish).
+    # Off by default: chain.json on disk then lags the last finished step.
+    metadata_async: bool = False
 
     # Size estimate guardrail:
     # We estimate size using memory_usage(deep=True). If object columns are heavy,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from contextvars import ContextVar
 from functools import wraps
+from itertools import chain
 from typing import Callable, TypeVar, Any, cast
 
 T = TypeVar("T")
@@ -13,6 +14,17 @@ def set_active_run(run: Any) -> None:
 def get_active_run() -> Any:
     return _active_run.get()
 
+# pandas.DataFrame, resolved on first recorded call. Importing pandas at module
+# scope would make `import blackbox` pay for it even when no run is active.
+_DataFrame: Any = None
+
+def _dataframe_type() -> Any:
+    global _DataFrame
+    if _DataFrame is None:
+        import pandas as pd
+        _DataFrame = pd.DataFrame
+    return _DataFrame
+
 def record_step(name: str):
     def deco(fn: Callable[..., T]) -> Callable[..., T]:
         @wraps(fn)
@@ -20,25 +32,14 @@ def record_step(name: str):
             run = get_active_run()
             if run is None:
                 return fn(*args, **kwargs)
+            df_type = _dataframe_type()
             # naive: first arg that is DataFrame is input_df
-            import pandas as pd
-            input_df = None
-            for a in args:
-                if isinstance(a, pd.DataFrame):
-                    input_df = a
-                    break
-            if input_df is None:
-                for v in kwargs.values():
-                    if isinstance(v, pd.DataFrame):
-                        input_df = v
-                        break
+            input_df = next((a for a in chain(args, kwargs.values()) if isinstance(a, df_type)), None)
             with run.step(name, input_df=input_df) as st:
                 out = fn(*args, **kwargs)
-                if hasattr(st, "capture_output"):
+                if isinstance(out, df_type) and hasattr(st, "capture_output"):
                     try:
-                        import pandas as pd
-                        if isinstance(out, pd.DataFrame):
-                            st.capture_output(out)
+                        st.capture_output(out)
                     except Exception:
                         pass
                 return out
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 
+_PD_DF = pd.DataFrame
+
 
 def describe_engine(obj: Any) -> str:
     if obj is None:
@@ -14,54 +16,74 @@ def describe_engine(obj: Any) -> str:
     return f"{mod}.{name}".strip(".")
 
 
-def to_pandas(obj: Any) -> pd.DataFrame:
-    """
-    Convert common dataframe-like objects to pandas DataFrame.
-    Supports:
-      - pandas.DataFrame (no-op)
-      - Spark DataFrame via toPandas()
-      - Polars via to_pandas()
-      - Polars LazyFrame via collect().to_pandas()
-      - PyArrow Table/RecordBatch/Dataset
-      - DuckDB relations via to_df()
-    """
-    if isinstance(obj, pd.DataFrame):
-        return obj
+def _identity(obj: Any) -> pd.DataFrame:
+    return obj
+
+
+def _resolve_converter(obj: Any) -> Callable[[Any], pd.DataFrame] | None:
     # Polars LazyFrame
     if hasattr(obj, "collect") and obj.__class__.__module__.startswith("polars"):
-        obj = obj.collect()
+        return lambda o: to_pandas(o.collect())
     if hasattr(obj, "toPandas"):
-        return obj.toPandas()
+        return lambda o: o.toPandas()
     if hasattr(obj, "to_pandas"):
-        return obj.to_pandas()
+        return lambda o: o.to_pandas()
     if hasattr(obj, "to_df"):
-        return obj.to_df()
+        return lambda o: o.to_df()
     # PyArrow
     try:
         import pyarrow as pa  # type: ignore
         if isinstance(obj, pa.Table):
-            return obj.to_pandas()
+            return lambda o: o.to_pandas()
         if isinstance(obj, pa.RecordBatch):
-            return pa.Table.from_batches([obj]).to_pandas()
+            return lambda o: pa.Table.from_batches([o]).to_pandas()
         if isinstance(obj, pa.dataset.Dataset):
-            return obj.to_table().to_pandas()
+            return lambda o: o.to_table().to_pandas()
     except Exception:
         pass
-    raise TypeError(f"Unsupported dataframe type: {describe_engine(obj)}")
+    return None
+
+
+# Converter per concrete type, resolved from the first instance seen.
+# None marks a type known to be unsupported. is_dataframe_like reads the
+# same table, so a type is resolved once for both functions.
+_CONVERTERS: dict[type, Callable[[Any], pd.DataFrame] | None] = {pd.DataFrame: _identity, type(None): None}
+
+
+def _converter(obj: Any) -> Callable[[Any], pd.DataFrame] | None:
+    t = type(obj)
+    try:
+        return _CONVERTERS[t]
+    except KeyError:
+        conv = _identity if isinstance(obj, pd.DataFrame) else _resolve_converter(obj)
+        _CONVERTERS[t] = conv
+        return conv
+
+
+def to_pandas(obj: Any) -> pd.DataFrame:
+    """
+    Convert common dataframe-like objects to pandas DataFrame.
+    Supports:
+      - pandas.DataFrame (no-op)
+      - Spark DataFrame via toPandas()
+      - Polars via to_pandas()
+      - Polars LazyFrame via collect().to_pandas()
+      - PyArrow Table/RecordBatch/Dataset
+      - DuckDB relations via to_df()
+    """
+    # Plain pandas frames are nearly every input; skip the cache lookup for them.
+    if type(obj) is _PD_DF:
+        return obj
+    conv = _converter(obj)
+    if conv is None:
+        raise TypeError(f"Unsupported dataframe type: {describe_engine(obj)}")
+    return conv(obj)
 
 
 def is_dataframe_like(obj: Any) -> bool:
-    if isinstance(obj, pd.DataFrame):
-        return True
-    if hasattr(obj, "collect") and obj.__class__.__module__.startswith("polars"):
+    if type(obj) is _PD_DF:
         return True
-    try:
-        import pyarrow as pa  # type: ignore
-        if isinstance(obj, (pa.Table, pa.RecordBatch, pa.dataset.Dataset)):
-            return True
-    except Exception:
-        pass
-    return any(hasattr(obj, attr) for attr in ("toPandas", "to_pandas", "to_df"))
+    return _converter(obj) is not None
 
 
 def duckdb_sql_to_pandas(conn: Any, sql: str) -> pd.DataFrame:
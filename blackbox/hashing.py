@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+import sys
 import weakref
 
 import pandas as pd
@@ -13,25 +15,84 @@ def _is_polars_df(obj: Any) -> bool:
     return mod.startswith("polars")
 
 
-def _polars_hash_series(df: Any, cols: list[str]) -> list[int]:
+def _is_polars_lazy(obj: Any) -> bool:
+    return _is_polars_df(obj) and hasattr(obj, "collect")
+
+
+def _polars_columns(df: Any) -> list[str]:
+    # LazyFrame.columns resolves the schema with a warning; ask for it explicitly.
+    names = df.collect_schema().names() if _is_polars_lazy(df) else df.columns
+    return [str(c) for c in names]
+
+
+def _polars_height(df: Any) -> int:
+    import polars as pl  # type: ignore
+    if _is_polars_lazy(df):
+        return int(df.select(pl.len()).collect().item())
+    return int(df.height)
+
+
+def _polars_hash_series(df: Any, cols: list[str]) -> np.ndarray:
+    """
+    Row hashes over cols for a polars DataFrame or LazyFrame.
+
+    Runs as a lazy query on the streaming engine, so a LazyFrame (e.g. from
+    scan_parquet) only reads the hashed columns instead of being collected
+    whole first.
+    """
     import polars as pl  # type: ignore
     if not cols:
-        return [0] * df.height
+        return np.zeros(_polars_height(df), dtype="uint64")
+    lf = df.lazy()
     try:
-        series = df.select(pl.struct(cols).hash().alias("_h"))["_h"]
+        series = _polars_collect(lf.select(pl.struct(cols).hash().alias("_h")))["_h"]
     except Exception:
-        series = df.select(pl.all().hash_rows().alias("_h"))["_h"]
-    return [int(x) for x in series.to_list()]
+        series = _polars_collect(lf.select(cols)).hash_rows()
+    return series.to_numpy().astype("uint64", copy=False)
 
 
-def _polars_pk_series(df: Any, pk: list[str]) -> list[str]:
+def _polars_pk_expr(pk: list[str]) -> Any:
     import polars as pl  # type: ignore
     if len(pk) == 1:
-        series = df.select(pl.col(pk[0]).cast(pl.Utf8).alias("_k"))["_k"]
-        return [str(x) for x in series.to_list()]
-    parts = [pl.col(c).cast(pl.Utf8) for c in pk]
-    series = df.select(pl.concat_str(parts, separator="|").alias("_k"))["_k"]
-    return [str(x) for x in series.to_list()]
+        expr = pl.col(pk[0]).cast(pl.Utf8)
+    else:
+        expr = pl.concat_str([pl.col(c).cast(pl.Utf8) for c in pk], separator="|")
+    # Nulls keep their old str(None) spelling so keys match earlier payloads.
+    return expr.fill_null("None").alias("_k")
+
+
+def _polars_collect(lf: Any) -> Any:
+    try:
+        return lf.collect(engine="streaming")
+    except TypeError:
+        # polars < 1.23 spells the streaming engine as a flag.
+        return lf.collect(streaming=True)
+
+
+def _polars_diff_status(
+    aa: Any, bb: Any, pk: list[str], cols_hashed: list[str], *, keys_only: bool, check_unique: bool = True
+) -> Any:
+    """
+    Lazy full join of a and b on the PK string, with a _status column of
+    "added" / "removed" / "changed" (null for unchanged rows).
+    """
+    import polars as pl  # type: ignore
+    hashed = bool(cols_hashed) and not keys_only
+    key = _polars_pk_expr(pk)
+    a_lf = aa.lazy().select(key, (pl.struct(cols_hashed).hash() if hashed else pl.lit(0, dtype=pl.UInt64)).alias("_h_a"))
+    b_lf = bb.lazy().select(key, (pl.struct(cols_hashed).hash() if hashed else pl.lit(0, dtype=pl.UInt64)).alias("_h_b"))
+    # validate="1:1" makes the join itself reject duplicate keys on either side.
+    validate = "1:1" if check_unique else "m:m"
+    return a_lf.join(b_lf, on="_k", how="full", coalesce=True, validate=validate).select(
+        "_k",
+        pl.when(pl.col("_h_a").is_null())
+        .then(pl.lit("added"))
+        .when(pl.col("_h_b").is_null())
+        .then(pl.lit("removed"))
+        .when(pl.col("_h_a") != pl.col("_h_b"))
+        .then(pl.lit("changed"))
+        .alias("_status"),
+    )
 
 
 # ----------------------------
@@ -45,7 +106,8 @@ def schema_fingerprint(df: pd.DataFrame) -> dict[str, Any]:
       - dtype strings
     """
     cols = list(map(str, df.columns.tolist()))
-    dtypes = {str(c): str(df[c].dtype) for c in df.columns}
+    # One df.dtypes pass instead of building a Series per column.
+    dtypes = dict(zip(cols, map(str, list(df.dtypes))))
     return {"cols": cols, "dtypes": dtypes}
 
 
@@ -82,17 +144,70 @@ def schema_diff(a: pd.DataFrame, b: pd.DataFrame) -> dict[str, Any]:
 # Row hashing + fingerprints
 # ----------------------------
 
-def _normalize_pk_series(s: pd.Series) -> pd.Series:
-    # Normalize PK values to strings for stable JSON artifacts
-    # (also avoids issues with numpy scalar types).
+def _numeric_pk_kind(a: pd.Series, b: pd.Series) -> bool:
+    # True when both key columns are numpy numerics of the same kind (i/u/f),
+    # so raw values match exactly where their strings would.
+    return (
+        isinstance(a.dtype, np.dtype)
+        and isinstance(b.dtype, np.dtype)
+        and a.dtype.kind in "iuf"
+        and a.dtype.kind == b.dtype.kind
+    )
+
+
+def _normalize_pk_series(s: pd.Series, *, keep_numeric: bool = False) -> pd.Series:
+    # keep_numeric (see _numeric_pk_kind) skips the per-row string allocation;
+    # keys are only stringified when emitted into the payload. Otherwise keys
+    # are normalized to strings, so e.g. int keys on one side still match str
+    # keys on the other after a CSV/Parquet round-trip.
+    if keep_numeric:
+        return s
     return s.astype("string")
 
 
+def _key_sets(
+    a_idx: pd.Index, a_hash: np.ndarray, b_idx: pd.Index, b_hash: np.ndarray
+) -> tuple[pd.Index, pd.Index, pd.Index, np.ndarray]:
+    """
+    (added, removed, common, changed_mask) for unique key indexes.
+
+    One get_indexer lookup of a's keys in b (b's hashtable is already built by
+    the duplicate check) replaces difference/difference/intersection plus two
+    reindexes. Orders match those calls with sort=False: added in b order,
+    removed/common in a order; changed_mask is aligned to common.
+    """
+    b_pos = b_idx.get_indexer(a_idx)
+    a_in_b = b_pos >= 0
+    b_hit = np.zeros(len(b_idx), dtype=bool)
+    b_hit[b_pos[a_in_b]] = True
+    changed_mask = a_hash[a_in_b] != b_hash[b_pos[a_in_b]]
+    return b_idx[~b_hit], a_idx[~a_in_b], a_idx[a_in_b], changed_mask
+
+
+def _join_pk_columns(df: pd.DataFrame, pk: list[str]) -> pd.Series:
+    # Composite key "v1|v2|...": same strings as
+    # df[pk].astype("string").agg("|".join, axis=1), but str.cat concatenates
+    # whole columns instead of calling join once per row.
+    parts = [df[c].astype("string") for c in pk]
+    return parts[0].str.cat(parts[1:], sep="|")
+
+
+# Row-hash caches live on the frame itself, so they are freed with it and
+# never carried over to copies or pickles. Objects without a __dict__ fall
+# back to an id()-keyed table cleaned up by a weakref callback.
+_ROW_HASH_ATTR = "_blackbox_rowhash_cache"
 _ROW_HASH_CACHE: dict[int, dict[str, Any]] = {}
 _ROW_HASH_REFS: dict[int, weakref.ref] = {}
 
 
 def _get_rowhash_cache(df: pd.DataFrame) -> dict[str, Any]:
+    attrs = getattr(df, "__dict__", None)
+    if attrs is not None:
+        cache = attrs.get(_ROW_HASH_ATTR)
+        if cache is None:
+            cache = attrs[_ROW_HASH_ATTR] = {}
+        return cache
+
     key = id(df)
     ref = _ROW_HASH_REFS.get(key)
     if ref is None or ref() is not df:
@@ -114,26 +229,170 @@ def _auto_parallel_settings(
     threshold_cols: int,
     workers: int,
     group_size_default: int,
-) -> tuple[int, int]:
+    rows: int = 0,
+    process_threshold_cells: int = 0,
+) -> tuple[int, int, bool]:
+    """
+    Returns (group_size, parallel_groups, use_processes).
+
+    use_processes is only chosen on the auto path when the caller opted in with
+    a non-zero process_threshold_cells, rows * cols reaches it, and forking is
+    safe here (see _fork_available); threads stay the default.
+    """
     if not auto_parallel:
-        return group_size, parallel_groups
+        return group_size, parallel_groups, False
     if group_size or parallel_groups:
-        return group_size, parallel_groups
+        return group_size, parallel_groups, False
     if cols_count >= threshold_cols:
-        return group_size_default, max(2, int(workers))
-    return group_size, parallel_groups
+        use_processes = bool(
+            process_threshold_cells
+            and rows * cols_count >= process_threshold_cells
+            and _fork_available()
+        )
+        return group_size_default, max(2, int(workers)), use_processes
+    return group_size, parallel_groups, False
+
+
+def _fork_available() -> bool:
+    # Forking with other threads alive (snapshot/metadata writers, scheduler
+    # workers, BLAS pools) can deadlock the child, and macOS system libraries
+    # are not fork-safe at all.
+    import multiprocessing as mp
+    import threading
+    if sys.platform == "darwin" or threading.active_count() > 1:
+        return False
+    return "fork" in mp.get_all_start_methods()
 
 
 def _rowhash_cache_key(cols: list[str], *, group_size: int) -> str:
     return f"cols={','.join(cols)}|group={group_size}"
 
 
-def _hash_frame(df: pd.DataFrame, cols: list[str]) -> pd.Series:
-    x = df[cols].copy(deep=False)
-    obj_cols = [c for c in cols if x[c].dtype == "object"]
-    for c in obj_cols:
-        x[c] = x[c].astype("string")
-    return pd.util.hash_pandas_object(x, index=False)
+def _hash_numpy_column(s: pd.Series) -> np.ndarray:
+    # Plain NumPy columns: hash the values directly, skipping the
+    # Series/index wrapping hash_pandas_object does (same result).
+    return pd.util.hash_array(s.to_numpy())
+
+
+def _hash_object_column(s: pd.Series) -> np.ndarray:
+    values = s.to_numpy()
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        return _hash_str_values(values)
+    return pd.util.hash_pandas_object(s.astype("string"), index=False).to_numpy()
+
+
+def _hash_string_column(s: pd.Series) -> np.ndarray:
+    if not s.hasnans:
+        return _hash_str_values(s.to_numpy(dtype=object))
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+def _hash_other_column(s: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+def _resolve_column_hasher(dtype: Any) -> Callable[[pd.Series], np.ndarray]:
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "biufcmM":
+            return _hash_numpy_column
+        if dtype.kind == "O":
+            return _hash_object_column
+    if isinstance(dtype, pd.StringDtype):
+        return _hash_string_column
+    return _hash_other_column
+
+
+# Keyed by dtype class (NumPy >= 1.25 has one class per kind/width), so the
+# branch is resolved once per type rather than per column per chunk, and
+# lookups never hash dtype instances (CategoricalDtype hashes its categories).
+# Older NumPy reports every dtype as np.dtype itself; that key is never cached.
+_COLUMN_HASHERS: dict[type, Callable[[pd.Series], np.ndarray]] = {}
+
+
+def _hash_column(s: pd.Series) -> np.ndarray:
+    t = type(s.dtype)
+    hasher = _COLUMN_HASHERS.get(t)
+    if hasher is None:
+        hasher = _resolve_column_hasher(s.dtype)
+        if t is not np.dtype:
+            _COLUMN_HASHERS[t] = hasher
+    return hasher(s)
+
+
+def _hash_str_values(values: np.ndarray) -> np.ndarray:
+    # NA-free str values hash the same as their "string" dtype column. Going
+    # through hash_array directly skips the string-array copy and lets us drop
+    # the categorize step (factorize, hash uniques, take), which only pays off
+    # when values repeat; a 1k-row sample decides.
+    head = values[:1024]
+    categorize = len(set(head.tolist())) * 2 <= len(head)
+    return pd.util.hash_array(values, categorize=categorize)
+
+
+def _combine_hash_arrays(arrays: Iterable[np.ndarray], num_items: int, n: int) -> np.ndarray:
+    # Same mixing as pandas' DataFrame hashing (CPython tuple hash), so combined
+    # per-column hashes match hash_pandas_object(df, index=False) bit-for-bit.
+    # arrays may be a generator: each column is folded in right after it is
+    # hashed, while it is still in cache.
+    mult = np.uint64(1000003)
+    out = np.full(n, 0x345678, dtype="uint64")
+    for i, a in enumerate(arrays):
+        inverse_i = num_items - i
+        out ^= a
+        out *= mult
+        mult += np.uint64(82520 + inverse_i + inverse_i)
+    out += np.uint64(97531)
+    return out
+
+
+def column_hashes(df: pd.DataFrame, cols: list[str]) -> dict[str, np.ndarray]:
+    """
+    Per-column uint64 row hashes for `cols`.
+
+    Pass the result as `precomputed=` to content_fingerprint_rowhash to skip
+    re-encoding columns (e.g. static string columns) on repeated calls.
+    """
+    return {c: _hash_column(df[c]) for c in cols}
+
+
+def _hash_frame_values(
+    df: pd.DataFrame,
+    cols: list[str],
+    precomputed: dict[str, np.ndarray] | None = None,
+    collect: dict[str, np.ndarray] | None = None,
+) -> np.ndarray:
+    # Hash column by column and mix with pandas' combine step; this matches
+    # hash_pandas_object(df[cols], index=False) without building the sub-frame
+    # or string copies of object columns. Returns a fresh, writable array.
+    # Columns hashed here (not taken from precomputed) are added to collect.
+    n = len(df)
+    pre = precomputed or {}
+
+    def _one(c: str) -> np.ndarray:
+        h = pre.get(c)
+        if h is not None and len(h) >= n:
+            return h[:n]
+        h = _hash_column(df[c])
+        if collect is not None:
+            collect[c] = h
+        return h
+
+    return _combine_hash_arrays(map(_one, cols), len(cols), n)
+
+
+def _hash_frame(
+    df: pd.DataFrame,
+    cols: list[str],
+    precomputed: dict[str, np.ndarray] | None = None,
+    collect: dict[str, np.ndarray] | None = None,
+) -> pd.Series:
+    return pd.Series(_hash_frame_values(df, cols, precomputed, collect), index=df.index, dtype="uint64", copy=False)
+
+
+@lru_cache(maxsize=64)
+def _column_groups(cols: tuple[str, ...], group_size: int) -> list[list[str]]:
+    # Same layout for every chunk of a diff; built once per (cols, group_size).
+    return [list(cols[i : i + group_size]) for i in range(0, len(cols), group_size)]
 
 
 def _rowhash_series(
@@ -143,9 +402,17 @@ def _rowhash_series(
     group_size: int = 0,
     parallel_groups: int = 0,
     cache_rowhash: bool = False,
+    precomputed: dict[str, np.ndarray] | None = None,
+    use_processes: bool = False,
+    collect: dict[str, np.ndarray] | None = None,
 ) -> pd.Series:
     """
     Uses pandas built-in hashing for speed; returns uint64 hashes.
+
+    use_processes: hash column groups in forked worker processes instead of
+    threads (see _hash_groups_forked).
+    collect: filled with the per-column hashes computed along the way (not
+    from forked workers, whose arrays stay in the child).
     """
     if not cols:
         return pd.Series([0] * len(df), index=df.index, dtype="uint64")
@@ -158,22 +425,29 @@ def _rowhash_series(
             return cached
 
     if group_size and group_size > 0 and len(cols) > group_size:
-        groups: list[list[str]] = []
-        for i in range(0, len(cols), group_size):
-            groups.append(cols[i : i + group_size])
+        groups = _column_groups(tuple(cols), group_size)
 
-        if parallel_groups and parallel_groups > 1 and len(groups) > 1:
+        def _one(g: list[str]) -> np.ndarray:
+            return _hash_frame_values(df, g, precomputed, collect)
+
+        if parallel_groups and parallel_groups > 1 and len(groups) > 1 and use_processes:
+            parts = _hash_groups_forked(df, groups, precomputed, workers=parallel_groups)
+        elif parallel_groups and parallel_groups > 1 and len(groups) > 1:
             from concurrent.futures import ThreadPoolExecutor
             with ThreadPoolExecutor(max_workers=parallel_groups) as ex:
-                parts = list(ex.map(lambda g: _hash_frame(df, g), groups))
+                parts = list(ex.map(_one, groups))
         else:
-            parts = [_hash_frame(df, g) for g in groups]
-
-        h = parts[0]
-        for p in parts[1:]:
-            h = h ^ p
+            parts = map(_one, groups)
+
+        # XOR group hashes into the first group's fresh array in place: no
+        # intermediate Series per step and no stacked copy of all groups.
+        it = iter(parts)
+        out = next(it)
+        for p in it:
+            np.bitwise_xor(out, p, out=out)
+        h = pd.Series(out, index=df.index, dtype="uint64", copy=False)
     else:
-        h = _hash_frame(df, cols)
+        h = _hash_frame(df, cols, precomputed, collect)
 
     if cache_rowhash:
         cache = _get_rowhash_cache(df)
@@ -181,6 +455,52 @@ def _rowhash_series(
     return h
 
 
+_FORK_INPUT: tuple[pd.DataFrame, dict[str, np.ndarray] | None] | None = None
+
+
+def _set_fork_input(df: pd.DataFrame, precomputed: dict[str, np.ndarray] | None) -> None:
+    global _FORK_INPUT
+    _FORK_INPUT = (df, precomputed)
+
+
+def _hash_group_in_worker(cols: list[str]) -> np.ndarray:
+    df, precomputed = _FORK_INPUT  # type: ignore[misc]
+    return _hash_frame_values(df, cols, precomputed)
+
+
+def _hash_groups_forked(
+    df: pd.DataFrame,
+    groups: list[list[str]],
+    precomputed: dict[str, np.ndarray] | None,
+    *,
+    workers: int,
+) -> list[np.ndarray]:
+    """
+    Hash column groups in forked worker processes.
+
+    Workers inherit df copy-on-write through fork (initializer args are not
+    pickled under fork), so only each group's uint64 result is sent back.
+    Unlike threads, per-column Python dispatch in the hashers runs in parallel.
+    """
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(groups)),
+        mp_context=mp.get_context("fork"),
+        initializer=_set_fork_input,
+        initargs=(df, precomputed),
+    ) as ex:
+        return list(ex.map(_hash_group_in_worker, groups))
+
+
+def _smallest_hashes(vals: np.ndarray, k: int = 10) -> list[int]:
+    # k smallest uint64 hashes, ascending. Partitioning first avoids a full
+    # sort on large frames; only the k-slice is sorted, in NumPy.
+    if len(vals) > k:
+        vals = np.partition(vals, k - 1)[:k]
+    return np.sort(vals).tolist()
+
+
 def content_fingerprint_rowhash(
     df: pd.DataFrame,
     *,
@@ -190,36 +510,31 @@ def content_fingerprint_rowhash(
     parallel_groups: int = 0,
     cache_rowhash: bool = False,
     native_polars: bool = False,
+    precomputed: dict[str, np.ndarray] | None = None,
+    column_hashes_out: dict[str, np.ndarray] | None = None,
 ) -> dict[str, Any]:
     """
     Lightweight content fingerprint:
       - hashes rows over all columns
       - aggregates into a small representative sample
     Note: Not cryptographic; sealing handles tamper evidence.
+
+    precomputed: optional column_hashes() output for df; those columns are
+    not re-hashed. The fingerprint is identical either way.
+    column_hashes_out: filled with the per-column hashes computed here, for
+    diff_rowhash(a_precomputed=/b_precomputed=) on the same frame.
     """
     if hasattr(df, "shape") and df.shape[0] == 0:
         return {"mode": "rowhash", "label": "h64", "sample": [], "n": 0}
 
     dfx = df
-    if sample_rows and sample_rows > 0 and len(df) > sample_rows:
+    if sample_rows and sample_rows > 0 and (_is_polars_lazy(df) or len(df) > sample_rows):
         dfx = df.head(int(sample_rows))
 
     if native_polars and _is_polars_df(dfx):
-        cols = [str(c) for c in dfx.columns]
-        hashes = _polars_hash_series(dfx, cols)
-        if not order_sensitive:
-            vals = np.asarray(hashes, dtype="uint64")
-            k = min(10, len(vals))
-            if k == 0:
-                take = []
-            elif len(vals) <= k:
-                take = sorted(vals.tolist())
-            else:
-                part = np.partition(vals, k - 1)[:k]
-                take = sorted(part.tolist())
-        else:
-            take = list(map(int, hashes[: min(10, len(hashes))]))
-        return {"mode": "rowhash", "label": "h64", "sample": take, "n": int(len(dfx))}
+        hashes = _polars_hash_series(dfx, _polars_columns(dfx))
+        take = hashes[:10].tolist() if order_sensitive else _smallest_hashes(hashes)
+        return {"mode": "rowhash", "label": "h64", "sample": take, "n": int(len(hashes))}
 
     cols = [str(c) for c in dfx.columns]
     hashes = _rowhash_series(
@@ -228,21 +543,12 @@ def content_fingerprint_rowhash(
         group_size=hash_group_size,
         parallel_groups=parallel_groups,
         cache_rowhash=cache_rowhash,
+        precomputed=precomputed,
+        collect=column_hashes_out,
     )
 
-    if not order_sensitive:
-        vals = hashes.to_numpy(copy=False)
-        k = min(10, len(vals))
-        if k == 0:
-            take = []
-        elif len(vals) <= k:
-            take = sorted(vals.astype("uint64").tolist())
-        else:
-            # Faster than full sort for large frames: partition to k smallest.
-            part = np.partition(vals, k - 1)[:k]
-            take = sorted(part.astype("uint64").tolist())
-    else:
-        take = hashes.head(min(10, len(hashes))).astype("uint64").tolist()
+    vals = hashes.to_numpy()
+    take = vals[:10].tolist() if order_sensitive else _smallest_hashes(vals)
     return {"mode": "rowhash", "label": "h64", "sample": take, "n": int(len(dfx))}
 
 
@@ -275,8 +581,12 @@ def diff_rowhash(
     auto_parallel_threshold_cols: int = 40,
     auto_parallel_workers: int = 4,
     auto_hash_group_size: int = 8,
+    auto_parallel_process_cells: int = 0,
     cache_rowhash: bool = False,
     native_polars: bool = False,
+    pk_is_unique: bool = False,
+    a_precomputed: dict[str, np.ndarray] | None = None,
+    b_precomputed: dict[str, np.ndarray] | None = None,
 ) -> tuple[dict[str, Any], DiffSummary]:
     """
     PK-based diff (rowhash mode).
@@ -285,20 +595,28 @@ def diff_rowhash(
       - Hash only SHARED non-PK columns between a and b.
       - Record schema-only columns in notes.
       - Optionally: treat schema add/remove as "all common keys changed".
+
+    pk_is_unique: caller guarantees primary keys are unique on both sides, so
+    the duplicate-key checks are skipped. Results are undefined if they are not.
+
+    a_precomputed / b_precomputed: per-column hashes of a / b (e.g. from
+    content_fingerprint_rowhash(column_hashes_out=)); those columns are not
+    re-hashed. Arrays must cover the frame's leading rows.
     """
-    if a.shape[1] == 0 or b.shape[1] == 0:
+    lazy = _is_polars_lazy(a) or _is_polars_lazy(b)
+    a_cols = _polars_columns(a) if _is_polars_lazy(a) else [str(c) for c in a.columns]
+    b_cols = _polars_columns(b) if _is_polars_lazy(b) else [str(c) for c in b.columns]
+    if not a_cols or not b_cols:
         raise ValueError("diff_rowhash requires both dataframes to have at least one column")
 
     if primary_key is None:
-        if "id" in a.columns and "id" in b.columns:
+        if "id" in a_cols and "id" in b_cols:
             pk = ["id"]
         else:
-            pk = [str(a.columns[0])]
+            pk = [a_cols[0]]
     else:
         pk = [str(x) for x in primary_key]
 
-    a_cols = [str(c) for c in a.columns]
-    b_cols = [str(c) for c in b.columns]
     a_set = set(a_cols)
     b_set = set(b_cols)
 
@@ -314,8 +632,15 @@ def diff_rowhash(
     pk_set = set(pk)
     cols_hashed = [c for c in common_cols if c not in pk_set]
 
+    # Rows hashed per _rowhash_series call (one chunk in chunked mode).
+    rows_hashed = 0 if lazy else max(len(a), len(b))
+    if sample_rows and sample_rows > 0:
+        rows_hashed = min(rows_hashed, int(sample_rows))
+    if chunk_rows and chunk_rows > 0:
+        rows_hashed = min(rows_hashed, int(chunk_rows))
+
     # Auto-parallelize wide frames unless user provided explicit settings.
-    hash_group_size, parallel_groups = _auto_parallel_settings(
+    hash_group_size, parallel_groups, hash_processes = _auto_parallel_settings(
         len(cols_hashed),
         hash_group_size,
         parallel_groups,
@@ -323,54 +648,59 @@ def diff_rowhash(
         threshold_cols=auto_parallel_threshold_cols,
         workers=auto_parallel_workers,
         group_size_default=auto_hash_group_size,
+        rows=rows_hashed,
+        process_threshold_cells=auto_parallel_process_cells,
     )
 
     if sample_rows and sample_rows > 0:
-        aa = a.head(int(sample_rows)).copy()
-        bb = b.head(int(sample_rows)).copy()
+        aa = a.head(int(sample_rows))
+        bb = b.head(int(sample_rows))
+        if isinstance(aa, pd.DataFrame):
+            aa = aa.copy()
+        if isinstance(bb, pd.DataFrame):
+            bb = bb.copy()
     else:
         aa = a
         bb = b
 
+    keys_only = diff_mode == "keys-only"
+    schema_changed = bool(cols_only_in_left or cols_only_in_right)
+
     if native_polars and _is_polars_df(aa) and _is_polars_df(bb):
-        # Polars-native hashing path (experimental)
-        pk = [str(x) for x in (primary_key or (["id"] if "id" in a.columns and "id" in b.columns else [str(a.columns[0])]))]
-        cols_hashed = [c for c in common_cols if c not in set(pk)]
-        a_keys = _polars_pk_series(aa, pk)
-        b_keys = _polars_pk_series(bb, pk)
-        if len(a_keys) != len(set(a_keys)):
-            raise ValueError("Primary key values must be unique in 'a'")
-        if len(b_keys) != len(set(b_keys)):
-            raise ValueError("Primary key values must be unique in 'b'")
-        if keys_only or not cols_hashed:
-            a_map = {k: 0 for k in a_keys}
-            b_map = {k: 0 for k in b_keys}
-        else:
-            a_hash = _polars_hash_series(aa, cols_hashed)
-            b_hash = _polars_hash_series(bb, cols_hashed)
-            a_map = {k: int(v) for k, v in zip(a_keys, a_hash)}
-            b_map = {k: int(v) for k, v in zip(b_keys, b_hash)}
-        a_set = set(a_map.keys())
-        b_set = set(b_map.keys())
-        added_keys = sorted(list(b_set - a_set))
-        removed_keys = sorted(list(a_set - b_set))
-        common_keys = a_set & b_set
-        if keys_only:
-            changed_keys = []
-        else:
-            changed_keys = sorted([k for k in common_keys if a_map[k] != b_map[k]])
-        added_count = len(added_keys)
-        removed_count = len(removed_keys)
-        changed_count = len(changed_keys)
-        total_keys = int(total_keys_hint or max(len(a_set), len(b_set)))
+        # Polars-native hashing path (experimental); LazyFrames stay lazy.
+        import polars as pl  # type: ignore
+        # One lazy join plan, collected once: only added/removed/changed rows
+        # come back, so unchanged rows never leave polars.
+        status = _polars_diff_status(aa, bb, pk, cols_hashed, keys_only=keys_only, check_unique=not pk_is_unique)
+        try:
+            flagged = _polars_collect(status.filter(pl.col("_status").is_not_null()).sort("_k"))
+        except pl.exceptions.ComputeError:
+            dup_expr = _polars_pk_expr(pk).is_duplicated().any()
+            if _polars_collect(aa.lazy().select(dup_expr)).item():
+                raise ValueError("Primary key values must be unique in 'a'") from None
+            if _polars_collect(bb.lazy().select(dup_expr)).item():
+                raise ValueError("Primary key values must be unique in 'b'") from None
+            raise
+        keys_by_status = {
+            label: flagged.filter(pl.col("_status") == label)["_k"]
+            for label in ("added", "removed", "changed")
+        }
+        added_count = len(keys_by_status["added"])
+        removed_count = len(keys_by_status["removed"])
+        changed_count = len(keys_by_status["changed"])
+        total_keys = int(total_keys_hint or max(_polars_height(aa), _polars_height(bb)))
         summary_only = False
         if summary_only_threshold is not None and summary_only_threshold > 0:
             ratio = (added_count + removed_count) / max(total_keys, 1)
             if ratio >= summary_only_threshold:
                 summary_only = True
-                added_keys = []
-                removed_keys = []
-                changed_keys = []
+
+        if summary_only:
+            added_keys, removed_keys, changed_keys = [], [], []
+        else:
+            added_keys = keys_by_status["added"].to_list()
+            removed_keys = keys_by_status["removed"].to_list()
+            changed_keys = keys_by_status["changed"].to_list()
 
         payload: dict[str, Any] = {
             "version": "0.1",
@@ -399,80 +729,68 @@ def diff_rowhash(
                 "hash_group_size": int(hash_group_size or 0),
                 "parallel_groups": int(parallel_groups or 0),
                 "native_polars": True,
+                "pk_uniqueness_asserted": bool(pk_is_unique),
             },
         }
         summary = DiffSummary(added=added_count, removed=removed_count, changed=changed_count)
         return payload, summary
 
-    single_pk = len(pk) == 1
-    if single_pk:
-        # Avoid string conversions for performance; convert to string only for output.
-        a_pk = aa[pk[0]]
-        b_pk = bb[pk[0]]
-    else:
-        a_pk = aa[pk].astype("string").agg("|".join, axis=1)
-        b_pk = bb[pk].astype("string").agg("|".join, axis=1)
-
-    if a_pk.duplicated(keep=False).any():
-        dup = a_pk[a_pk.duplicated(keep=False)].astype("string")
-        sample = sorted(set(dup.head(5).tolist()))
-        raise ValueError(f"Primary key values must be unique in 'a'; duplicates found (sample={sample})")
-
-    if b_pk.duplicated(keep=False).any():
-        dup = b_pk[b_pk.duplicated(keep=False)].astype("string")
-        sample = sorted(set(dup.head(5).tolist()))
-        raise ValueError(f"Primary key values must be unique in 'b'; duplicates found (sample={sample})")
-
-    keys_only = diff_mode == "keys-only"
+    def _pk_index(pk_series: pd.Series, side: str) -> pd.Index:
+        # Index.has_duplicates is a single hashtable pass (cached on the index,
+        # so _key_sets reuses it); the full duplicated() mask is only built to
+        # report a sample.
+        keys = pd.Index(pk_series.to_numpy())
+        if not pk_is_unique and keys.has_duplicates:
+            dup = pk_series[pk_series.duplicated(keep=False)].astype("string")
+            sample = sorted(set(dup.head(5).tolist()))
+            raise ValueError(f"Primary key values must be unique in '{side}'; duplicates found (sample={sample})")
+        return keys
+
+    def _build_map_chunked(
+        df: pd.DataFrame, side: str, precomputed: dict[str, np.ndarray] | None, keep_numeric: bool
+    ) -> pd.Series:
+        # All keys are held in memory anyway, so normalize them in one pass and
+        # check uniqueness before hashing; only row hashing walks the chunks,
+        # writing into one preallocated array.
+        if len(pk) == 1:
+            pk_series = _normalize_pk_series(df[pk[0]], keep_numeric=keep_numeric)
+        else:
+            pk_series = _join_pk_columns(df, pk)
+        keys = _pk_index(pk_series, side)
 
-    def _build_map_chunked(df: pd.DataFrame) -> dict[str, int]:
-        mapping: dict[str, int] = {}
-        keys_seen: set[str] = set()
         n = len(df)
-        step = int(chunk_rows) if chunk_rows and chunk_rows > 0 else n
+        if keys_only or not cols_hashed:
+            return pd.Series(np.zeros(n, dtype="uint64"), index=keys)
+        hashes = np.empty(n, dtype="uint64")
+        step = int(chunk_rows)
+        pre = {c: h for c, h in (precomputed or {}).items() if len(h) >= n}
         for start in range(0, n, step):
             end = min(start + step, n)
-            dfx = df.iloc[start:end]
-            if len(pk) == 1:
-                pk_series = _normalize_pk_series(dfx[pk[0]])
-            else:
-                pk_series = dfx[pk].astype("string").agg("|".join, axis=1)
-
-            if pk_series.duplicated(keep=False).any():
-                dup = pk_series[pk_series.duplicated(keep=False)].astype("string")
-                sample = sorted(set(dup.head(5).tolist()))
-                raise ValueError(f"Primary key values must be unique; duplicates found (sample={sample})")
-
-            pk_values = pk_series.astype("string").tolist()
-            for k in pk_values:
-                if k in keys_seen:
-                    raise ValueError(f"Primary key values must be unique; duplicate found: {k}")
-                keys_seen.add(k)
-
-            if keys_only or not cols_hashed:
-                for k in pk_values:
-                    mapping[k] = 0
-            else:
-                h = _rowhash_series(
-                    dfx,
-                    cols_hashed,
-                    group_size=hash_group_size,
-                    parallel_groups=parallel_groups,
-                    cache_rowhash=cache_rowhash,
-                )
-                for k, v in zip(pk_values, h.values):
-                    mapping[k] = int(v)
-        return mapping
-
-    if chunk_rows and chunk_rows > 0:
-        a_map = _build_map_chunked(aa)
-        b_map = _build_map_chunked(bb)
-        a_keys = set(a_map.keys())
-        b_keys = set(b_map.keys())
-        added_count = int(len(b_keys - a_keys))
-        removed_count = int(len(a_keys - b_keys))
-        common_keys = a_keys & b_keys
+            hashes[start:end] = _rowhash_series(
+                df.iloc[start:end],
+                cols_hashed,
+                group_size=hash_group_size,
+                parallel_groups=parallel_groups,
+                cache_rowhash=cache_rowhash,
+                precomputed={c: h[start:end] for c, h in pre.items()},
+                use_processes=hash_processes,
+            ).to_numpy()
+        return pd.Series(hashes, index=keys)
+
+    chunked = bool(chunk_rows and chunk_rows > 0)
+    if chunked:
+        # Keys are built and checked once per side, inside the chunked build.
+        keep_numeric = len(pk) == 1 and _numeric_pk_kind(aa[pk[0]], bb[pk[0]])
+        a_map = _build_map_chunked(aa, "a", a_precomputed, keep_numeric)
+        b_map = _build_map_chunked(bb, "b", b_precomputed, keep_numeric)
     else:
+        if len(pk) == 1:
+            # Avoid string conversions for performance; convert to string only for output.
+            a_pk_idx = _pk_index(aa[pk[0]], "a")
+            b_pk_idx = _pk_index(bb[pk[0]], "b")
+        else:
+            a_pk_idx = _pk_index(_join_pk_columns(aa, pk), "a")
+            b_pk_idx = _pk_index(_join_pk_columns(bb, pk), "b")
         if keys_only or not cols_hashed:
             a_hash = pd.Series([0] * len(aa), index=aa.index, dtype="uint64")
             b_hash = pd.Series([0] * len(bb), index=bb.index, dtype="uint64")
@@ -483,6 +801,8 @@ def diff_rowhash(
                 group_size=hash_group_size,
                 parallel_groups=parallel_groups,
                 cache_rowhash=cache_rowhash,
+                precomputed=a_precomputed,
+                use_processes=hash_processes,
             )
             b_hash = _rowhash_series(
                 bb,
@@ -490,44 +810,23 @@ def diff_rowhash(
                 group_size=hash_group_size,
                 parallel_groups=parallel_groups,
                 cache_rowhash=cache_rowhash,
+                precomputed=b_precomputed,
+                use_processes=hash_processes,
             )
 
-        a_map = pd.Series(a_hash.values, index=pd.Index(a_pk.values))
-        b_map = pd.Series(b_hash.values, index=pd.Index(b_pk.values))
-
-        a_idx = a_map.index
-        b_idx = b_map.index
-        added_idx = b_idx.difference(a_idx, sort=False)
-        removed_idx = a_idx.difference(b_idx, sort=False)
-        common_idx = a_idx.intersection(b_idx, sort=False)
-        added_count = int(added_idx.size)
-        removed_count = int(removed_idx.size)
-        common_keys = set(common_idx.tolist())
+        a_map = pd.Series(a_hash.values, index=a_pk_idx)
+        b_map = pd.Series(b_hash.values, index=b_pk_idx)
 
-    if keys_only:
-        changed_count = 0
+    added_idx, removed_idx, common_idx, changed_mask = _key_sets(
+        a_map.index, a_map.to_numpy(), b_map.index, b_map.to_numpy()
+    )
+    if keys_only or not common_idx.size:
         changed_mask = None
-    else:
-        if chunk_rows and chunk_rows > 0:
-            changed_count = 0
-            for k in common_keys:
-                if a_map[k] != b_map[k]:
-                    changed_count += 1
-            changed_mask = None
-        else:
-            if common_idx.size:
-                a_vals = a_map.reindex(common_idx).values
-                b_vals = b_map.reindex(common_idx).values
-                changed_mask = a_vals != b_vals
-                changed_count = int(changed_mask.sum())
-            else:
-                changed_mask = None
-                changed_count = 0
+    added_count = int(added_idx.size)
+    removed_count = int(removed_idx.size)
+    changed_count = int(changed_mask.sum()) if changed_mask is not None else 0
 
-    if chunk_rows and chunk_rows > 0:
-        total_keys = int(total_keys_hint or max(len(a_keys), len(b_keys)))
-    else:
-        total_keys = int(total_keys_hint or max(len(a_idx), len(b_idx)))
+    total_keys = int(total_keys_hint or max(len(a_map), len(b_map)))
     summary_only = False
     if summary_only_threshold is not None and summary_only_threshold > 0:
         ratio = (added_count + removed_count) / max(total_keys, 1)
@@ -535,29 +834,23 @@ def diff_rowhash(
             summary_only = True
 
     if not summary_only:
-        if chunk_rows and chunk_rows > 0:
-            added_keys = sorted(list(b_keys - a_keys))
-            removed_keys = sorted(list(a_keys - b_keys))
-            if keys_only:
-                changed_keys = []
-            else:
-                changed_keys = sorted([k for k in common_keys if a_map[k] != b_map[k]])
+        added_keys = sorted([str(x) for x in added_idx.tolist()])
+        removed_keys = sorted([str(x) for x in removed_idx.tolist()])
+        if changed_mask is not None:
+            changed_keys = [str(x) for x in common_idx[changed_mask].tolist()]
+            if chunked:
+                # Chunked payloads have always listed changed keys sorted.
+                changed_keys.sort()
         else:
-            added_keys = sorted([str(x) for x in added_idx.tolist()])
-            removed_keys = sorted([str(x) for x in removed_idx.tolist()])
-            if common_idx.size and changed_mask is not None:
-                changed_keys = [str(x) for x in common_idx[changed_mask].tolist()]
-            else:
-                changed_keys = []
+            changed_keys = []
     else:
         added_keys = []
         removed_keys = []
         changed_keys = []
 
-    schema_changed = bool(cols_only_in_left or cols_only_in_right)
     if treat_schema_add_remove_as_change and schema_changed:
-        changed_keys = sorted([str(k) for k in common_keys])
-        changed_count = len(common_keys)
+        changed_keys = sorted([str(k) for k in common_idx.tolist()])
+        changed_count = int(common_idx.size)
 
     payload: dict[str, Any] = {
         "version": "0.1",
@@ -585,6 +878,7 @@ def diff_rowhash(
             "chunk_rows": int(chunk_rows or 0),
             "hash_group_size": int(hash_group_size or 0),
             "parallel_groups": int(parallel_groups or 0),
+            "pk_uniqueness_asserted": bool(pk_is_unique),
         },
     }
 
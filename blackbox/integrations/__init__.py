@@ -1,15 +1,22 @@
 from .airflow import blackbox_task, blackbox_task_in_run
-from .dagster import blackbox_op, blackbox_op_in_run
-from .dbt import collect_dbt_artifacts
-from .warehouses import WarehouseSource, load_sources, load_dataframe
+from .dagster import blackbox_op, blackbox_op_in_run, start_dagster_run, finish_dagster_run
+from .dbt import collect_dbt_artifacts, copy_dbt_artifacts, load_dbt_run_results
+from .warehouses import WarehouseSource, load_sources, load_dataframe, load_dataframes, iter_dataframe, load_aggregate
 
 __all__ = [
     "blackbox_task",
     "blackbox_task_in_run",
     "blackbox_op",
     "blackbox_op_in_run",
+    "start_dagster_run",
+    "finish_dagster_run",
     "collect_dbt_artifacts",
+    "copy_dbt_artifacts",
+    "load_dbt_run_results",
     "WarehouseSource",
     "load_sources",
     "load_dataframe",
+    "load_dataframes",
+    "iter_dataframe",
+    "load_aggregate",
 ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Callable
 
-from blackbox.engines import is_dataframe_like, to_pandas
+from blackbox.engines import is_dataframe_like
 
 
 def blackbox_task(recorder, name: str, func: Callable[..., Any], *, run=None):
@@ -14,7 +14,8 @@ def blackbox_task(recorder, name: str, func: Callable[..., Any], *, run=None):
         with active_run.step(name) as st:
             result = func(*args, **kwargs)
             if is_dataframe_like(result):
-                st.capture_output(to_pandas(result))
+                # capture_output converts to pandas itself.
+                st.capture_output(result)
             else:
                 st.add_metadata(result_type=str(type(result)))
         if run is None:
@@ -1,23 +1,75 @@
 from __future__ import annotations
 
+import atexit
 from typing import Any, Callable
 
-from blackbox.engines import is_dataframe_like, to_pandas
+from blackbox.context import get_active_run, set_active_run
+from blackbox.engines import is_dataframe_like
+
+# Runs started by start_dagster_run and not finished yet, by id(run).
+_OPEN_RUNS: dict[int, Any] = {}
+
+
+def start_dagster_run(recorder, *, tags: dict[str, str] | None = None, **kwargs: Any):
+    """
+    Start one run for a whole Dagster job and make it the active run.
+
+    blackbox_op wrappers without run= then record into it instead of starting
+    and finishing a run per op. Close it with finish_dagster_run(); runs still
+    open at interpreter exit are finished then.
+    """
+    run = recorder.start_run(tags={"source": "dagster", **(tags or {})}, **kwargs)
+    _OPEN_RUNS[id(run)] = run
+    set_active_run(run)
+    return run
+
+
+def finish_dagster_run(run, **kwargs: Any) -> None:
+    if _OPEN_RUNS.pop(id(run), None) is None:
+        return
+    if get_active_run() is run:
+        set_active_run(None)
+    run.finish(**kwargs)
+
+
+@atexit.register
+def _finish_open_runs() -> None:
+    for run in list(_OPEN_RUNS.values()):
+        try:
+            finish_dagster_run(run)
+        except Exception:
+            pass
+
+
+def _job_run(recorder) -> Any:
+    # Only join runs start_dagster_run opened; any other active run belongs to
+    # someone else's scope and may be finished under us.
+    active = get_active_run()
+    if active is not None and id(active) in _OPEN_RUNS and active.recorder is recorder:
+        return active
+    return None
 
 
 def blackbox_op(recorder, name: str, func: Callable[..., Any], *, run=None):
     """
     Wrap a Dagster op/asset callable so it records a run and step automatically.
+
+    Steps go to run, else to the run from start_dagster_run, else to a
+    fresh run per call.
     """
     def _wrapped(*args, **kwargs):
-        active_run = run or recorder.start_run(tags={"source": "dagster"})
+        active_run = run or _job_run(recorder)
+        owned = active_run is None
+        if owned:
+            active_run = recorder.start_run(tags={"source": "dagster"})
         with active_run.step(name) as st:
             result = func(*args, **kwargs)
             if is_dataframe_like(result):
-                st.capture_output(to_pandas(result))
+                # capture_output converts to pandas itself.
+                st.capture_output(result)
             else:
                 st.add_metadata(result_type=str(type(result)))
-        if run is None:
+        if owned:
             active_run.finish()
         return result
     return _wrapped
@@ -1,7 +1,28 @@
 from __future__ import annotations
 
 import os
-from typing import Dict
+from collections import Counter
+from typing import Any, Dict
+
+from ..util import json_loads
+
+
+_DBT_ARTIFACTS = ("run_results.json", "manifest.json")
+
+
+def _dbt_artifact_paths(root: str) -> Dict[str, str]:
+    # One directory listing instead of an isdir plus an exists per name;
+    # scandir entries usually answer is_file() without another stat.
+    try:
+        with os.scandir(os.path.join(root, "target")) as it:
+            entries = {e.name: e for e in it if e.name in _DBT_ARTIFACTS}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    return {
+        name: entries[name].path
+        for name in _DBT_ARTIFACTS
+        if name in entries and entries[name].is_file()
+    }
 
 
 def collect_dbt_artifacts(root: str) -> Dict[str, bytes]:
@@ -10,12 +31,43 @@ def collect_dbt_artifacts(root: str) -> Dict[str, bytes]:
     Returns dict of filename -> bytes.
     """
     out: Dict[str, bytes] = {}
-    target = os.path.join(root, "target")
-    if not os.path.isdir(target):
-        return out
-    for name in ("run_results.json", "manifest.json"):
-        path = os.path.join(target, name)
-        if os.path.exists(path):
-            with open(path, "rb") as f:
-                out[name] = f.read()
+    for name, path in _dbt_artifact_paths(root).items():
+        with open(path, "rb") as f:
+            out[name] = f.read()
     return out
+
+
+def copy_dbt_artifacts(root: str, store: Any, prefix: str, *, chunk_size: int = 1024 * 1024) -> list[str]:
+    """
+    Stream dbt artifacts into store under prefix; returns the names copied.
+
+    Unlike collect_dbt_artifacts, a large manifest.json is never held in
+    memory whole when the store writes through (LocalStore.open_writer).
+    """
+    import shutil
+
+    names = []
+    for name, path in _dbt_artifact_paths(root).items():
+        with open(path, "rb") as src, store.open_writer(f"{prefix}/{name}", content_type="application/json") as dst:
+            shutil.copyfileobj(src, dst, chunk_size)
+        names.append(name)
+    return names
+
+
+def load_dbt_run_results(path: str) -> Dict[str, Any]:
+    """
+    Summarize a dbt run_results.json for run metadata or tags.
+    """
+    # Bytes straight to json_loads: orjson (when installed) decodes UTF-8 itself.
+    with open(path, "rb") as f:
+        data = json_loads(f.read())
+    metadata = data.get("metadata") or {}
+    results = data.get("results") or []
+    return {
+        "dbt_invocation_id": metadata.get("invocation_id"),
+        "dbt_generated_at": metadata.get("generated_at"),
+        "dbt_elapsed_time": data.get("elapsed_time"),
+        "dbt_results": len(results),
+        # Counter counts in C; dict() keeps the summary plain JSON.
+        "dbt_status_counts": dict(Counter((r.get("status") or "unknown") for r in results)),
+    }
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import copy
 import os
+import re
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterator, Literal
 
 import pandas as pd
 
@@ -14,91 +19,520 @@ class WarehouseSource:
     options: dict[str, Any]
 
 
+# yaml module and the fastest safe loader it offers, resolved on first use.
+# PyYAML stays optional, so it is not imported at module scope.
+_YAML: Any = None
+_YAML_LOADER: Any = None
+
+
+def _yaml_loader() -> tuple[Any, Any]:
+    global _YAML, _YAML_LOADER
+    if _YAML is None:
+        try:
+            import yaml  # type: ignore
+        except Exception as e:
+            raise RuntimeError("PyYAML is required for warehouse config. Install with: pip install PyYAML") from e
+        # libyaml's C loader when PyYAML was built with it; same safe semantics.
+        _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        _YAML = yaml
+    return _YAML, _YAML_LOADER
+
+
 def _load_yaml(path: str) -> dict[str, Any]:
-    try:
-        import yaml  # type: ignore
-    except Exception as e:
-        raise RuntimeError("PyYAML is required for warehouse config. Install with: pip install PyYAML") from e
+    yaml, loader = _yaml_loader()
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=loader) or {}
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    # mtime_ns/size are only cache-key parts: an edited file gets a new entry.
+    return _load_yaml(path)
 
 
 def load_sources(config_path: str | None = None) -> dict[str, WarehouseSource]:
     path = config_path or os.environ.get("BLACKBOX_WAREHOUSE_CONFIG", "config/warehouses.yml")
-    if not os.path.exists(path):
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         return {}
-    raw = _load_yaml(path)
+    # Only the parsed YAML is cached; every call gets fresh sources with their own
+    # copy of the options, so a caller mutating one can't change what the next sees.
+    raw = _load_yaml_cached(path, st.st_mtime_ns, st.st_size)
     sources = {}
     for name, cfg in (raw.get("sources") or {}).items():
         kind = cfg.get("kind")
         if not kind:
             continue
-        sources[name] = WarehouseSource(name=name, kind=kind, options=cfg)
+        sources[name] = WarehouseSource(name=name, kind=kind, options=copy.deepcopy(cfg))
     return sources
 
 
+# kind -> (SQLAlchemy dialect, default DBAPI driver).
+_SQL_DIALECTS: dict[str, tuple[str, str]] = {
+    "redshift": ("postgresql", "psycopg2"),
+    "postgres": ("postgresql", "psycopg2"),
+    "mysql": ("mysql", "pymysql"),
+}
+
+
+def _sql_url(kind: str, opts: dict[str, Any]) -> str:
+    url = opts.get("url")
+    if url:
+        return url
+    sa = _sqlalchemy()
+    dialect, default_driver = _SQL_DIALECTS[kind]
+    port = opts.get("port") or os.environ.get("DB_PORT")
+    # URL.create escapes "@", ":" and "/" in credentials, which plain string
+    # formatting passed through and broke the URL on.
+    return sa.URL.create(
+        f"{dialect}+{opts.get('driver') or default_driver}",
+        username=opts.get("user") or os.environ.get("DB_USER"),
+        password=opts.get("password") or os.environ.get("DB_PASSWORD"),
+        host=opts.get("host") or os.environ.get("DB_HOST"),
+        port=int(port) if port else None,
+        database=opts.get("database") or os.environ.get("DB_NAME"),
+    ).render_as_string(hide_password=False)
+
+
+def _read_sql_connectorx(
+    kind: str, opts: dict[str, Any], url: str, sql: str, *, return_type: str = "pandas"
+) -> Any:
+    """
+    Load via ConnectorX when the source sets connectorx: true; None means
+    use SQLAlchemy.
+
+    ConnectorX builds columns straight from the wire format instead of going
+    through per-row Python tuples, and can split the query across
+    connections with partition_on/partition_num. Opt-in: its dtypes differ
+    from pd.read_sql (Decimal as float64, nullable ints, datetime
+    resolution), and with them schema/content fingerprints.
+    """
+    if opts.get("connectorx") is not True:
+        return None
+    try:
+        import connectorx as cx  # type: ignore
+    except Exception as e:
+        raise RuntimeError("connectorx required for sources with connectorx: true") from e
+    # ConnectorX takes plain schemes, without SQLAlchemy's "+driver" part.
+    scheme, _, rest = url.partition("://")
+    scheme = scheme.split("+", 1)[0]
+    if kind == "redshift":
+        scheme = "redshift"
+    kwargs: dict[str, Any] = {}
+    if opts.get("partition_on"):
+        kwargs["partition_on"] = opts["partition_on"]
+        kwargs["partition_num"] = int(opts.get("partition_num", 4))
+    return cx.read_sql(f"{scheme}://{rest}", sql, return_type=return_type, **kwargs)
+
+
+def _snowflake_connect(opts: dict[str, Any]) -> Any:
+    try:
+        import snowflake.connector  # type: ignore
+    except Exception as e:
+        raise RuntimeError("snowflake-connector-python required for Snowflake") from e
+    return snowflake.connector.connect(
+        user=opts.get("user") or os.environ.get("SNOWFLAKE_USER"),
+        password=opts.get("password") or os.environ.get("SNOWFLAKE_PASSWORD"),
+        account=opts.get("account") or os.environ.get("SNOWFLAKE_ACCOUNT"),
+        warehouse=opts.get("warehouse") or os.environ.get("SNOWFLAKE_WAREHOUSE"),
+        database=opts.get("database") or os.environ.get("SNOWFLAKE_DATABASE"),
+        schema=opts.get("schema") or os.environ.get("SNOWFLAKE_SCHEMA"),
+        role=opts.get("role") or os.environ.get("SNOWFLAKE_ROLE"),
+    )
+
+
+def _bigquery_job(opts: dict[str, Any], sql: str) -> Any:
+    try:
+        from google.cloud import bigquery  # type: ignore
+    except Exception as e:
+        raise RuntimeError("google-cloud-bigquery required for BigQuery") from e
+    client = bigquery.Client(project=opts.get("project") or os.environ.get("GOOGLE_CLOUD_PROJECT"))
+    return client.query(sql, job_config=bigquery.QueryJobConfig(query_parameters=[]))
+
+
+@lru_cache(maxsize=8)
+def _bqstorage_client(project: str | None) -> Any:
+    # One BigQuery Storage read client per project; they hold a gRPC channel
+    # that is expensive to set up. None if the storage API isn't installed.
+    try:
+        from google.cloud import bigquery_storage  # type: ignore
+    except Exception:
+        return None
+    return bigquery_storage.BigQueryReadClient()
+
+
+def _read_sql_kwargs(opts: dict[str, Any]) -> dict[str, Any]:
+    # dtype_backend: pyarrow (or numpy_nullable) on a source keeps strings in
+    # Arrow buffers instead of one Python object per value. Opt-in: it
+    # changes dtypes, and with them schema/content fingerprints.
+    backend = opts.get("dtype_backend")
+    return {"dtype_backend": backend} if backend else {}
+
+
+def _bigquery_to_pandas(job: Any, opts: dict[str, Any]) -> pd.DataFrame:
+    # Reuse the cached Storage API client, but let to_dataframe() build the
+    # frame: its nullable Int64/boolean/dbdate dtypes differ from a plain
+    # Arrow to_pandas(), and fingerprints depend on them.
+    if opts.get("dtype_backend") == "pyarrow":
+        return _bigquery_to_arrow(job, opts).to_pandas(types_mapper=pd.ArrowDtype)
+    bq_storage = _bqstorage_client(opts.get("project") or os.environ.get("GOOGLE_CLOUD_PROJECT"))
+    if bq_storage is None:
+        return job.to_dataframe()
+    return job.to_dataframe(bqstorage_client=bq_storage, create_bqstorage_client=False)
+
+
+def _bigquery_to_arrow(job: Any, opts: dict[str, Any]) -> Any:
+    bq_storage = _bqstorage_client(opts.get("project") or os.environ.get("GOOGLE_CLOUD_PROJECT"))
+    return job.to_arrow(bqstorage_client=bq_storage, create_bqstorage_client=False)
+
+
+def _sqlalchemy():
+    try:
+        import sqlalchemy as sa  # type: ignore
+    except Exception as e:
+        raise RuntimeError("sqlalchemy required for SQL warehouses") from e
+    return sa
+
+
+@lru_cache(maxsize=256)
+def _sql_text(sql: str) -> Any:
+    # TextClause per query string, built before a pooled connection is
+    # checked out; repeated queries reuse it (and its compiled-cache key).
+    return _sqlalchemy().text(sql)
+
+
+# Engines per (url, pool_size). An engine owns a connection pool, so reusing
+# it lets later queries skip the connect/TLS/auth handshake.
+_ENGINES: dict[tuple[str, int], Any] = {}
+
+
+def _engine_for(url: str, opts: dict[str, Any]) -> Any:
+    key = (url, int(opts.get("pool_size", 5)))
+    engine = _ENGINES.get(key)
+    if engine is None:
+        sa = _sqlalchemy()
+        # create_engine doesn't connect, so a racing duplicate is harmless.
+        engine = _ENGINES.setdefault(key, sa.create_engine(url, pool_pre_ping=True, pool_size=key[1]))
+    return engine
+
+
+# (source name, kind, sql, params, return_type) -> (expiry on time.monotonic(), result).
+_RESULT_CACHE: dict[tuple[str, str, str, str, str], tuple[float, Any]] = {}
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _result_cache_ttl() -> float:
+    try:
+        return float(os.environ.get("BLACKBOX_SQL_CACHE_TTL", "0"))
+    except ValueError:
+        return 0.0
+
+
+ReturnType = Literal["pandas", "arrow", "polars"]
+
+
+def _copy_result(obj: Any) -> Any:
+    # pyarrow Tables are immutable and can be shared as they are.
+    if isinstance(obj, pd.DataFrame):
+        return obj.copy()
+    if hasattr(obj, "clone"):
+        return obj.clone()
+    return obj
+
+
 def load_dataframe(
     source: WarehouseSource,
     sql: str,
     *,
     params: dict[str, Any] | None = None,
+    chunksize: int | None = None,
+    cache_ttl: float | None = None,
+    return_type: ReturnType = "pandas",
+) -> Any:
+    """
+    Run sql against source and return the full result.
+
+    return_type "arrow" gives a pyarrow.Table and "polars" a polars
+    DataFrame. Where the driver can produce Arrow (BigQuery Storage,
+    Snowflake fetch_arrow_all, ConnectorX when enabled) the pandas step is skipped.
+
+    chunksize reads the result in pieces (see iter_dataframe) and
+    concatenates them, so the driver never buffers the whole result as rows.
+
+    cache_ttl (seconds; default BLACKBOX_SQL_CACHE_TTL, else 0 = off) reuses
+    an earlier result of the same query in this process until it expires.
+    Snapshots are evidence, so caching is opt-in.
+    """
+    if return_type not in ("pandas", "arrow", "polars"):
+        raise ValueError(f"Unsupported return_type: {return_type!r}")
+    ttl = _result_cache_ttl() if cache_ttl is None else float(cache_ttl)
+    if ttl <= 0:
+        return _load_result(source, sql, params=params, chunksize=chunksize, return_type=return_type)
+
+    key = (source.name, source.kind.lower(), sql.strip(), repr(sorted((params or {}).items())), return_type)
+    now = time.monotonic()
+    with _RESULT_CACHE_LOCK:
+        hit = _RESULT_CACHE.get(key)
+    if hit is not None and hit[0] > now:
+        # Copy so a caller mutating its frame can't change the cached result.
+        return _copy_result(hit[1])
+    df = _load_result(source, sql, params=params, chunksize=chunksize, return_type=return_type)
+    with _RESULT_CACHE_LOCK:
+        # Drop expired results on write so stale frames don't pile up.
+        for k in [k for k, (exp, _) in _RESULT_CACHE.items() if exp <= now]:
+            del _RESULT_CACHE[k]
+        _RESULT_CACHE[key] = (now + ttl, _copy_result(df))
+    return df
+
+
+def _load_result(
+    source: WarehouseSource,
+    sql: str,
+    *,
+    params: dict[str, Any] | None,
+    chunksize: int | None,
+    return_type: ReturnType,
+) -> Any:
+    if return_type == "pandas":
+        return _load_dataframe(source, sql, params=params, chunksize=chunksize)
+    table = _load_arrow(source, sql, params=params, chunksize=chunksize)
+    if return_type == "polars":
+        import polars as pl  # type: ignore
+        return pl.from_arrow(table)
+    return table
+
+
+def _load_arrow(
+    source: WarehouseSource,
+    sql: str,
+    *,
+    params: dict[str, Any] | None,
+    chunksize: int | None,
+) -> Any:
+    import pyarrow as pa
+
+    kind = source.kind.lower()
+    opts = source.options
+    if not chunksize:
+        if kind == "snowflake":
+            conn = _snowflake_connect(opts)
+            try:
+                cur = conn.cursor()
+                cur.execute(sql, params)
+                table = cur.fetch_arrow_all()
+            finally:
+                conn.close()
+            # fetch_arrow_all returns None for an empty result.
+            if table is not None:
+                return table
+        elif kind == "bigquery":
+            return _bigquery_to_arrow(_bigquery_job(opts, sql), opts)
+        elif kind in ("redshift", "postgres", "mysql") and params is None:
+            table = _read_sql_connectorx(kind, opts, _sql_url(kind, opts), sql, return_type="arrow")
+            if table is not None:
+                return table
+    df = _load_dataframe(source, sql, params=params, chunksize=chunksize)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _load_dataframe(
+    source: WarehouseSource,
+    sql: str,
+    *,
+    params: dict[str, Any] | None,
+    chunksize: int | None,
+) -> pd.DataFrame:
+    kind = source.kind.lower()
+    opts = source.options
+
+    if chunksize:
+        chunks = list(iter_dataframe(source, sql, params=params, chunksize=chunksize))
+        if not chunks:
+            return pd.DataFrame()
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
+
+    if kind == "snowflake":
+        conn = _snowflake_connect(opts)
+        try:
+            return pd.read_sql(sql, conn, params=params, **_read_sql_kwargs(opts))
+        finally:
+            conn.close()
+
+    if kind == "bigquery":
+        return _bigquery_to_pandas(_bigquery_job(opts, sql), opts)
+
+    if kind in ("redshift", "postgres", "mysql"):
+        url = _sql_url(kind, opts)
+        if params is None:
+            # Arrow-backed frames come straight from ConnectorX's Arrow output.
+            if opts.get("dtype_backend") == "pyarrow":
+                table = _read_sql_connectorx(kind, opts, url, sql, return_type="arrow")
+                df = None if table is None else table.to_pandas(types_mapper=pd.ArrowDtype)
+            else:
+                df = _read_sql_connectorx(kind, opts, url, sql)
+            if df is not None:
+                return df
+        stmt = _sql_text(sql)
+        with _engine_for(url, opts).connect() as conn:
+            return pd.read_sql(stmt, conn, params=params, **_read_sql_kwargs(opts))
+
+    raise RuntimeError(f"Unsupported warehouse kind: {kind}")
+
+
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*)*$")
+_AGG_FUNCS = {
+    "count": "COUNT({})",
+    "count_distinct": "COUNT(DISTINCT {})",
+    "sum": "SUM({})",
+    "avg": "AVG({})",
+    "min": "MIN({})",
+    "max": "MAX({})",
+}
+
+
+def _ident(name: str) -> str:
+    if not _IDENT_RE.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+def aggregate_sql(
+    table: str,
+    group_by: list[str],
+    aggs: dict[str, tuple[str, str]],
+    *,
+    where: str | None = None,
+    limit: int | None = None,
+) -> str:
+    """
+    Compose SELECT group_by, aggs FROM table [WHERE] GROUP BY group_by [LIMIT].
+
+    aggs maps output alias -> (func, column); func is one of count,
+    count_distinct, sum, avg, min, max and column may be "*" for count.
+    Identifiers are validated rather than quoted so the SQL stays valid on
+    every supported warehouse; where is passed through as written.
+    """
+    if not aggs:
+        raise ValueError("aggs must name at least one aggregate")
+    cols = [_ident(c) for c in group_by]
+    exprs = []
+    for alias, (func, column) in aggs.items():
+        template = _AGG_FUNCS.get(func.lower())
+        if template is None:
+            raise ValueError(f"Unsupported aggregate: {func!r}")
+        arg = "*" if column == "*" and func.lower() == "count" else _ident(column)
+        exprs.append(f"{template.format(arg)} AS {_ident(alias)}")
+    sql = f"SELECT {', '.join(cols + exprs)} FROM {_ident(table)}"
+    if where:
+        sql += f" WHERE {where}"
+    if cols:
+        sql += f" GROUP BY {', '.join(cols)}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql
+
+
+def load_aggregate(
+    source: WarehouseSource,
+    table: str,
+    group_by: list[str],
+    aggs: dict[str, tuple[str, str]],
+    *,
+    where: str | None = None,
+    limit: int | None = None,
+    params: dict[str, Any] | None = None,
 ) -> pd.DataFrame:
+    """
+    Aggregate in the warehouse and return only the grouped result.
+
+    Prefer this to load_dataframe("SELECT * ...") followed by a pandas
+    groupby: the warehouse reduces the rows, and only one row per group
+    crosses the network. Runs through load_dataframe, so its fast paths and
+    result cache apply. See aggregate_sql for the arguments.
+    """
+    sql = aggregate_sql(table, group_by, aggs, where=where, limit=limit)
+    return load_dataframe(source, sql, params=params)
+
+
+def load_dataframes(
+    source: WarehouseSource,
+    sql: str,
+    params_list: list[dict[str, Any]],
+) -> pd.DataFrame:
+    """
+    Run sql once per params dict and return the results concatenated.
+
+    All executions share one connection, so each binding costs a round-trip
+    rather than a new connection. Rows keep params_list order.
+    """
     kind = source.kind.lower()
     opts = source.options
+    if not params_list:
+        return pd.DataFrame()
+    read_kwargs = _read_sql_kwargs(opts)
 
     if kind == "snowflake":
+        conn = _snowflake_connect(opts)
         try:
-            import snowflake.connector  # type: ignore
-        except Exception as e:
-            raise RuntimeError("snowflake-connector-python required for Snowflake") from e
-        conn = snowflake.connector.connect(
-            user=opts.get("user") or os.environ.get("SNOWFLAKE_USER"),
-            password=opts.get("password") or os.environ.get("SNOWFLAKE_PASSWORD"),
-            account=opts.get("account") or os.environ.get("SNOWFLAKE_ACCOUNT"),
-            warehouse=opts.get("warehouse") or os.environ.get("SNOWFLAKE_WAREHOUSE"),
-            database=opts.get("database") or os.environ.get("SNOWFLAKE_DATABASE"),
-            schema=opts.get("schema") or os.environ.get("SNOWFLAKE_SCHEMA"),
-            role=opts.get("role") or os.environ.get("SNOWFLAKE_ROLE"),
-        )
+            frames = [pd.read_sql(sql, conn, params=params, **read_kwargs) for params in params_list]
+        finally:
+            conn.close()
+    elif kind in ("redshift", "postgres", "mysql"):
+        stmt = _sql_text(sql)
+        with _engine_for(_sql_url(kind, opts), opts).connect() as conn:
+            frames = [pd.read_sql(stmt, conn, params=params, **read_kwargs) for params in params_list]
+    elif kind == "bigquery":
+        raise RuntimeError("Query parameters are not supported for BigQuery sources")
+    else:
+        raise RuntimeError(f"Unsupported warehouse kind: {kind}")
+
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_dataframe(
+    source: WarehouseSource,
+    sql: str,
+    *,
+    params: dict[str, Any] | None = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the result of sql as DataFrames of at most chunksize rows.
+
+    Peak memory is one chunk rather than the whole result set. The
+    connection stays open until the iterator is exhausted or closed.
+    """
+    kind = source.kind.lower()
+    opts = source.options
+    chunksize = int(chunksize)
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+
+    if kind == "snowflake":
+        conn = _snowflake_connect(opts)
         try:
-            return pd.read_sql(sql, conn, params=params)
+            yield from pd.read_sql(sql, conn, params=params, chunksize=chunksize, **_read_sql_kwargs(opts))
         finally:
             conn.close()
+        return
 
     if kind == "bigquery":
-        try:
-            from google.cloud import bigquery  # type: ignore
-        except Exception as e:
-            raise RuntimeError("google-cloud-bigquery required for BigQuery") from e
-        client = bigquery.Client(project=opts.get("project") or os.environ.get("GOOGLE_CLOUD_PROJECT"))
-        job = client.query(sql, job_config=bigquery.QueryJobConfig(query_parameters=[]))
-        return job.to_dataframe()
+        yield from _bigquery_job(opts, sql).result(page_size=chunksize).to_dataframe_iterable()
+        return
 
     if kind in ("redshift", "postgres", "mysql"):
-        try:
-            import sqlalchemy as sa  # type: ignore
-        except Exception as e:
-            raise RuntimeError("sqlalchemy required for SQL warehouses") from e
-        url = opts.get("url")
-        if not url:
-            user = opts.get("user") or os.environ.get("DB_USER")
-            password = opts.get("password") or os.environ.get("DB_PASSWORD")
-            host = opts.get("host") or os.environ.get("DB_HOST")
-            port = opts.get("port") or os.environ.get("DB_PORT")
-            database = opts.get("database") or os.environ.get("DB_NAME")
-            driver = opts.get("driver")
-            scheme = {
-                "redshift": "postgresql+psycopg2",
-                "postgres": "postgresql+psycopg2",
-                "mysql": "mysql+pymysql",
-            }[kind]
-            auth = f"{user}:{password}@" if user or password else ""
-            hostpart = f"{host}:{port}" if port else (host or "")
-            url = f"{scheme}://{auth}{hostpart}/{database}"
-            if driver:
-                url = f"{scheme}+{driver}://{auth}{hostpart}/{database}"
-        engine = sa.create_engine(url)
-        with engine.connect() as conn:
-            return pd.read_sql(sa.text(sql), conn, params=params)
+        stmt = _sql_text(sql)
+        with _engine_for(_sql_url(kind, opts), opts).connect() as conn:
+            # stream_results uses a server-side cursor where the driver has
+            # one, so rows are fetched per chunk instead of all up front.
+            conn = conn.execution_options(stream_results=True)
+            yield from pd.read_sql(stmt, conn, params=params, chunksize=chunksize, **_read_sql_kwargs(opts))
+        return
 
     raise RuntimeError(f"Unsupported warehouse kind: {kind}")
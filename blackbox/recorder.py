@@ -1,23 +1,28 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 import traceback
 import uuid
 import logging
-import os
+import queue
+import sys
+import threading
 
 import pandas as pd
 
 from .config import DiffConfig, SnapshotConfig, SealConfig, RecorderConfig
 from .store import Store, LocalStore
-from .util import utc_now_iso, get_host_info, get_runtime_info, safe_path_component
+from .util import utc_now_iso, get_host_info, get_runtime_info, json_lines_bytes, safe_path_component
 from .hashing import schema_fingerprint, content_fingerprint_rowhash, diff_rowhash, schema_diff
 from .seal import payload_digest, chain_digest, verify_chain_with_payloads
 
 _logger = logging.getLogger("blackbox")
 
 
+@lru_cache(maxsize=1024)
 def _safe_name(s: str) -> str:
+    # Streaming runs rebuild the same few step prefixes for every batch.
     return safe_path_component(s, max_len=64)
 
 
@@ -30,6 +35,14 @@ def _rel_under(prefix: str, key: str) -> str:
     return key.split(f"{prefix}/")[-1] if key.startswith(f"{prefix}/") else key
 
 
+def _as_pandas(df: Any) -> Any:
+    # Normalize dataframe-like objects to pandas once, when they enter a step.
+    if df is None or isinstance(df, pd.DataFrame):
+        return df
+    from .engines import to_pandas, is_dataframe_like
+    return to_pandas(df) if is_dataframe_like(df) else df
+
+
 @dataclass
 class StepContext:
     run: "Run"
@@ -37,9 +50,16 @@ class StepContext:
     ordinal: int
     input_df: pd.DataFrame | None = None
     metadata: dict[str, Any] | None = None
+    # Already-computed fingerprint block for input_df (e.g. the previous
+    # step's output block); used instead of fingerprinting/snapshotting again.
+    input_meta: dict[str, Any] | None = None
 
     _started_at: str | None = None
     _output_df: pd.DataFrame | None = None
+    _output_meta: dict[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        self.input_df = _as_pandas(self.input_df)
 
     def __enter__(self) -> "StepContext":
         self._started_at = utc_now_iso()
@@ -47,7 +67,7 @@ class StepContext:
         return self
 
     def capture_output(self, df: pd.DataFrame) -> None:
-        self._output_df = df
+        self._output_df = _as_pandas(df)
 
     def add_metadata(self, **kwargs: Any) -> None:
         if self.metadata is None:
@@ -61,13 +81,6 @@ class StepContext:
         if self.run.recorder.config.enforce_explicit_output and exc_type is None and self._output_df is None:
             raise RuntimeError("Step finished without capture_output(df). v0.1 requires explicit output capture.")
 
-        # Normalize dataframe-like inputs to pandas
-        from .engines import to_pandas, is_dataframe_like
-        if self.input_df is not None and is_dataframe_like(self.input_df):
-            self.input_df = to_pandas(self.input_df)
-        if self._output_df is not None and is_dataframe_like(self._output_df):
-            self._output_df = to_pandas(self._output_df)
-
         step_key = self.run._step_prefix(self.ordinal, self.name)
         artifacts_prefix = f"{step_key}/artifacts"
 
@@ -87,16 +100,33 @@ class StepContext:
             "seal": None,
         }
 
+        # Per-column hashes from fingerprinting, reused by the rowhash diff.
+        diff_cfg = self.run.recorder.diff
+        will_diff = (
+            diff_cfg.mode != "none"
+            and diff_cfg.diff_mode == "rows"
+            and self.input_df is not None
+            and self._output_df is not None
+        )
+        input_hashes: dict[str, Any] | None = {} if will_diff else None
+        output_hashes: dict[str, Any] | None = {} if will_diff else None
+
         try:
             if self.input_df is not None:
-                step_obj["input"] = self.run._maybe_write_df_artifact(
-                    f"{artifacts_prefix}/input.bbdata", self.input_df
-                )
+                if self.input_meta is not None:
+                    step_obj["input"] = dict(self.input_meta)
+                else:
+                    step_obj["input"] = self.run._maybe_write_df_artifact(
+                        f"{artifacts_prefix}/input.bbdata", self.input_df, column_hashes=input_hashes
+                    )
 
             if self._output_df is not None:
                 step_obj["output"] = self.run._maybe_write_df_artifact(
-                    f"{artifacts_prefix}/output.bbdata", self._output_df
+                    f"{artifacts_prefix}/output.bbdata", self._output_df, column_hashes=output_hashes
                 )
+                # Copied before _pending_writes is popped, so a step reusing it
+                # as input_meta gets its size fields patched too.
+                self._output_meta = dict(step_obj["output"])
 
             if (self.input_df is not None) and (self._output_df is not None):
                 step_obj["schema_diff"] = schema_diff(self.input_df, self._output_df)
@@ -165,11 +195,15 @@ class StepContext:
                         auto_parallel_threshold_cols=self.run.recorder.diff.auto_parallel_threshold_cols,
                         auto_parallel_workers=self.run.recorder.diff.auto_parallel_workers,
                         auto_hash_group_size=self.run.recorder.diff.auto_hash_group_size,
+                        auto_parallel_process_cells=self.run.recorder.diff.auto_parallel_process_cells,
                         cache_rowhash=self.run.recorder.diff.cache_rowhash,
                         native_polars=self.run.recorder.diff.native_polars,
+                        pk_is_unique=self.run.recorder.diff.pk_is_unique,
+                        a_precomputed=input_hashes,
+                        b_precomputed=output_hashes,
                     )
                     diff_ref = f"{artifacts_prefix}/diff.bbdelta"
-                    self.run.store.put_json(diff_ref, diff_payload)
+                    self.run._put_json(diff_ref, diff_payload)
                     step_obj["diff"] = {
                         "mode": diff_mode,
                         "artifact": "artifacts/diff.bbdelta",
@@ -194,8 +228,8 @@ class StepContext:
                 meta = step_obj.get(field_name)
                 if isinstance(meta, dict) and "_pending_writes" in meta:
                     pending = meta.pop("_pending_writes")
-                    self.run._register_pending_writes(step_json_key, field_name, pending)
-            self.run.store.put_json(step_json_key, step_obj)
+                    self.run._register_pending_writes(step_json_key, field_name, pending, step_obj=step_obj)
+            self.run._put_json(step_json_key, step_obj)
 
             if self.run.recorder.seal.mode == "chain":
                 self.run._append_chain_entry(
@@ -211,6 +245,45 @@ class StepContext:
         return False
 
 
+# Object columns larger than this have their deep size extrapolated from
+# an evenly strided sample instead of measuring every Python object.
+_DEEP_SAMPLE_ROWS = 10_000
+
+
+def _holds_python_objects(dtype: Any) -> bool:
+    # object, and StringDtype ("string"/"str"; its python storage is an array
+    # of str objects, so the shallow size is only the pointer array).
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def _deep_memory_bytes(df: pd.DataFrame) -> int:
+    """
+    memory_usage(index=True, deep=True).sum(), sampling large object columns.
+
+    Only object/string (and categorical, via their categories) columns differ
+    between deep and shallow usage; every other dtype is its buffer size.
+    """
+    usage = df.memory_usage(index=True, deep=False).to_numpy()
+    total = int(usage.sum())
+    if _holds_python_objects(df.index.dtype):
+        total += int(df.index.memory_usage(deep=True)) - int(usage[0])
+    n = len(df)
+    for i, dtype in enumerate(df.dtypes):
+        if _holds_python_objects(dtype):
+            col = df.iloc[:, i]
+            if n > _DEEP_SAMPLE_ROWS:
+                sample = col.iloc[:: n // _DEEP_SAMPLE_ROWS]
+                deep = int(sample.memory_usage(index=False, deep=True) * n / len(sample))
+            else:
+                deep = int(col.memory_usage(index=False, deep=True))
+        elif isinstance(dtype, pd.CategoricalDtype):
+            deep = int(df.iloc[:, i].memory_usage(index=False, deep=True))
+        else:
+            continue
+        total += deep - int(usage[i + 1])
+    return total
+
+
 @dataclass
 class Recorder:
     store: Store
@@ -263,6 +336,7 @@ class Run:
     _events: list[dict[str, Any]] | None = None
     _pending_writes: list[dict[str, Any]] | None = None
     _snapshot_executor: Any | None = None
+    _metadata_writer: "_MetadataWriter | None" = None
 
     def _prefix(self) -> str:
         if self._run_prefix is None:
@@ -289,21 +363,20 @@ class Run:
 
     # Feature: callsite hints
     def _code_hint(self) -> dict[str, Any]:
-        import inspect
+        # Walk raw frames: inspect.stack() builds a FrameInfo (and reads
+        # source context) for every frame on the stack on each step.
         try:
-            for frameinfo in inspect.stack()[2:]:
-                fn = frameinfo.function
-                file = frameinfo.filename
-                norm = file.replace("\\", "/")
-                if "/blackbox/" in norm:
-                    continue
-                mod = inspect.getmodule(frameinfo.frame)
-                return {
-                    "module": getattr(mod, "__name__", None),
-                    "function": fn,
-                    "file": file,
-                    "line": int(frameinfo.lineno),
-                }
+            f = sys._getframe(2)
+            while f is not None:
+                file = f.f_code.co_filename
+                if "/blackbox/" not in file.replace("\\", "/"):
+                    return {
+                        "module": f.f_globals.get("__name__"),
+                        "function": f.f_code.co_name,
+                        "file": file,
+                        "line": int(f.f_lineno),
+                    }
+                f = f.f_back
         except Exception:
             pass
         return {"module": None, "function": None, "file": None, "line": None}
@@ -341,8 +414,8 @@ class Run:
                 "entries": [],
                 "head": None,
             }
+            # Also writes chain.json.
             self._append_chain_entry("run_start", created, self._run_start_key(), dict(base))
-            self.store.put_json(self._chain_key(), self._chain)
 
     def step(self, name: str, *, input_df: pd.DataFrame | None = None, metadata: dict[str, Any] | None = None) -> StepContext:
         self._step_counter += 1
@@ -366,13 +439,16 @@ class Run:
             st.capture_output(out)
 
     # Buffered events
-    def add_event(self, kind: str, message: str, *, data: dict[str, Any] | None = None) -> None:
+    def add_event(
+        self, kind: str, message: str, *, data: dict[str, Any] | None = None, ts: str | None = None
+    ) -> None:
+        # ts lets callers logging a batch of events stamp them with one timestamp.
         if self._events is None:
             self._events = []
-        self._events.append({"ts": utc_now_iso(), "kind": kind, "message": message, "data": data or {}})
+        self._events.append({"ts": ts or utc_now_iso(), "kind": kind, "message": message, "data": data or {}})
 
     # Fingerprints
-    def _df_fingerprints(self, df: pd.DataFrame) -> dict[str, Any]:
+    def _df_fingerprints(self, df: pd.DataFrame, column_hashes: dict[str, Any] | None = None) -> dict[str, Any]:
         group_size = self.recorder.diff.hash_group_size
         parallel_groups = self.recorder.diff.parallel_groups
         if self.recorder.diff.auto_parallel_wide and group_size == 0 and parallel_groups == 0:
@@ -389,6 +465,7 @@ class Run:
                 parallel_groups=parallel_groups,
                 cache_rowhash=self.recorder.diff.cache_rowhash,
                 native_polars=self.recorder.diff.native_polars,
+                column_hashes_out=column_hashes,
             ),
             "n_rows": int(len(df)),
             "n_cols": int(df.shape[1]),
@@ -397,10 +474,10 @@ class Run:
     def _estimate_df_mb(self, df: pd.DataFrame) -> float:
         """
         Cheap estimate used to decide skip BEFORE Parquet serialization.
-        Uses memory_usage(deep=True) which is usually a good proxy for snapshot size.
+        Uses deep memory usage (object columns sampled) as a proxy for snapshot size.
         """
         try:
-            bytes_used = int(df.memory_usage(index=True, deep=True).sum())
+            bytes_used = _deep_memory_bytes(df)
         except Exception:
             # fallback: rough estimate
             bytes_used = int(df.shape[0] * max(df.shape[1], 1) * 8)
@@ -413,12 +490,12 @@ class Run:
         n = int(self.recorder.snapshot.sample_rows)
         if n <= 0:
             n = 2000
-        dfx = df.head(n)
-
         cap_cols = int(self.recorder.snapshot.sample_cols)
-        if cap_cols and cap_cols > 0 and dfx.shape[1] > cap_cols:
-            dfx = dfx.iloc[:, :cap_cols]
-        return dfx
+        if cap_cols and cap_cols > 0 and df.shape[1] > cap_cols:
+            # One 2-D slice: head() then iloc[:, :cap] would build an
+            # intermediate frame over every column first.
+            return df.iloc[:n, :cap_cols]
+        return df.head(n)
 
     def _get_snapshot_executor(self):
         if self._snapshot_executor is None:
@@ -428,20 +505,20 @@ class Run:
             )
         return self._snapshot_executor
 
-    def _submit_parquet_write(self, key: str, df: pd.DataFrame):
+    def _parquet_compression(self) -> str | None:
         compression = self.recorder.config.parquet_compression
-        if compression == "none":
-            compression = None
+        return None if compression == "none" else compression
+
+    def _submit_parquet_write(self, key: str, df: pd.DataFrame):
         ex = self._get_snapshot_executor()
-        return ex.submit(self.store.put_parquet_df, key, df, compression=compression)
+        return ex.submit(self._write_parquet, key, df)
 
     def _write_parquet(self, key: str, df: pd.DataFrame) -> float:
-        compression = self.recorder.config.parquet_compression
-        if compression == "none":
-            compression = None
-        return self.store.put_parquet_df(key, df, compression=compression)
+        return self.store.put_parquet_df(key, df, compression=self._parquet_compression())
 
-    def _maybe_write_df_artifact(self, key: str, df: pd.DataFrame) -> dict[str, Any]:
+    def _maybe_write_df_artifact(
+        self, key: str, df: pd.DataFrame, *, column_hashes: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """
         MVP Snapshot policy:
           1) Compute fingerprints (audit signal) always.
@@ -451,13 +528,14 @@ class Run:
                - optionally write a small sample artifact (head N rows)
                - DO NOT Parquet-serialize full df
           4) Else serialize to Parquet and store.
+
+        column_hashes: filled with per-column row hashes from fingerprinting.
         """
-        from .engines import to_pandas
-        if not isinstance(df, pd.DataFrame):
-            df = to_pandas(df)
-        fp = self._df_fingerprints(df)
-        mode = self.recorder.snapshot.mode
-        max_mb = float(self.recorder.snapshot.max_mb)
+        fp = self._df_fingerprints(df, column_hashes)
+        snap = self.recorder.snapshot
+        snapshot_async = self.recorder.config.snapshot_async
+        mode = snap.mode
+        max_mb = float(snap.max_mb)
 
         if mode == "none":
             fp["artifact"] = None
@@ -470,32 +548,13 @@ class Run:
             fp["artifact"] = None
             fp["snapshot_skipped"] = {"reason": "size_estimate", "est_mb": round(est_mb, 3), "max_mb": max_mb}
 
-            if self.recorder.snapshot.sample_on_skip:
-                sample_key = key.replace(".bbdata", ".sample.bbdata")
-                try:
-                    dfx = self._sample_df(df)
-                    if self.recorder.config.snapshot_async:
-                        future = self._submit_parquet_write(sample_key, dfx)
-                        fp["sample_artifact"] = _rel_under(self._prefix(), sample_key)
-                        fp["sample_size_mb"] = None
-                        fp["sample_rows"] = int(len(dfx))
-                        fp["sample_pending"] = True
-                        fp.setdefault("_pending_writes", []).append(
-                            {"future": future, "size_field": "sample_size_mb"}
-                        )
-                    else:
-                        sample_mb = self._write_parquet(sample_key, dfx)
-                        fp["sample_artifact"] = _rel_under(self._prefix(), sample_key)
-                        fp["sample_size_mb"] = round(sample_mb, 3)
-                        fp["sample_rows"] = int(len(dfx))
-                except Exception as e:
-                    fp["sample_artifact"] = None
-                    fp["sample_error"] = str(e)
+            if snap.sample_on_skip:
+                self._write_sample(fp, key, df, snapshot_async)
 
             return fp
 
         # --- Store full artifact (auto below threshold OR always mode) ---
-        if self.recorder.config.snapshot_async:
+        if snapshot_async:
             future = self._submit_parquet_write(key, df)
             size_mb = None
             fp.setdefault("_pending_writes", []).append(
@@ -510,27 +569,8 @@ class Run:
             fp["artifact"] = None
             fp["snapshot_skipped"] = {"reason": "size", "size_mb": round(size_mb, 3), "max_mb": max_mb}
 
-            if self.recorder.snapshot.sample_on_skip:
-                sample_key = key.replace(".bbdata", ".sample.bbdata")
-                try:
-                    dfx = self._sample_df(df)
-                    if self.recorder.config.snapshot_async:
-                        future = self._submit_parquet_write(sample_key, dfx)
-                        fp["sample_artifact"] = _rel_under(self._prefix(), sample_key)
-                        fp["sample_size_mb"] = None
-                        fp["sample_rows"] = int(len(dfx))
-                        fp["sample_pending"] = True
-                        fp.setdefault("_pending_writes", []).append(
-                            {"future": future, "size_field": "sample_size_mb"}
-                        )
-                    else:
-                        sample_mb = self._write_parquet(sample_key, dfx)
-                        fp["sample_artifact"] = _rel_under(self._prefix(), sample_key)
-                        fp["sample_size_mb"] = round(sample_mb, 3)
-                        fp["sample_rows"] = int(len(dfx))
-                except Exception as e:
-                    fp["sample_artifact"] = None
-                    fp["sample_error"] = str(e)
+            if snap.sample_on_skip:
+                self._write_sample(fp, key, df, snapshot_async)
 
             return fp
 
@@ -540,7 +580,39 @@ class Run:
         fp["snapshot_est_mb"] = round(est_mb, 3)
         return fp
 
-    def _register_pending_writes(self, step_json_key: str, field_name: str, pending: list[dict[str, Any]]) -> None:
+    def _write_sample(self, fp: dict[str, Any], key: str, df: pd.DataFrame, snapshot_async: bool) -> None:
+        """
+        Store the head-N sample artifact for a skipped snapshot; records the outcome on fp.
+        """
+        # key always ends in ".bbdata"
+        sample_key = key[: -len(".bbdata")] + ".sample.bbdata"
+        try:
+            dfx = self._sample_df(df)
+            fp["sample_artifact"] = _rel_under(self._prefix(), sample_key)
+            if snapshot_async:
+                future = self._submit_parquet_write(sample_key, dfx)
+                fp["sample_size_mb"] = None
+                fp["sample_rows"] = int(len(dfx))
+                fp["sample_pending"] = True
+                fp.setdefault("_pending_writes", []).append(
+                    {"future": future, "size_field": "sample_size_mb"}
+                )
+            else:
+                sample_mb = self._write_parquet(sample_key, dfx)
+                fp["sample_size_mb"] = round(sample_mb, 3)
+                fp["sample_rows"] = int(len(dfx))
+        except Exception as e:
+            fp["sample_artifact"] = None
+            fp["sample_error"] = str(e)
+
+    def _register_pending_writes(
+        self,
+        step_json_key: str,
+        field_name: str,
+        pending: list[dict[str, Any]],
+        *,
+        step_obj: dict[str, Any] | None = None,
+    ) -> None:
         if not pending:
             return
         if self._pending_writes is None:
@@ -552,38 +624,57 @@ class Run:
                     "field_name": field_name,
                     "future": p["future"],
                     "size_field": p["size_field"],
+                    # The object written to step_json_key, patched in place on flush.
+                    "step_obj": step_obj,
                 }
             )
 
     def _flush_pending_writes(self) -> None:
         if not self._pending_writes:
             return
+        from concurrent.futures import wait
+
+        # Wait for every write first, then patch each step.json once even
+        # when both its input and output snapshots were pending.
+        wait([item["future"] for item in self._pending_writes])
+        by_key: dict[str, list[dict[str, Any]]] = {}
         for item in self._pending_writes:
-            future = item["future"]
+            by_key.setdefault(item["step_json_key"], []).append(item)
+
+        for step_json_key, items in by_key.items():
             try:
-                size_mb = future.result()
-                size_mb = round(float(size_mb), 3)
-                step_obj = self.store.get_json(item["step_json_key"])
-                field = step_obj.get(item["field_name"])
-                if isinstance(field, dict):
-                    field[item["size_field"]] = size_mb
-                    field["snapshot_pending"] = False
-                    field["sample_pending"] = False
-                    step_obj[item["field_name"]] = field
-                    self.store.put_json(item["step_json_key"], step_obj)
-            except Exception as e:
-                try:
-                    step_obj = self.store.get_json(item["step_json_key"])
+                step_obj = items[0]["step_obj"]
+                if step_obj is None:
+                    step_obj = self.store.get_json(step_json_key)
+                for item in items:
                     field = step_obj.get(item["field_name"])
-                    if isinstance(field, dict):
+                    if not isinstance(field, dict):
+                        continue
+                    try:
+                        field[item["size_field"]] = round(float(item["future"].result()), 3)
+                        field["snapshot_pending"] = False
+                        field["sample_pending"] = False
+                    except Exception as e:
                         field["snapshot_error"] = str(e)
-                        step_obj[item["field_name"]] = field
-                        self.store.put_json(item["step_json_key"], step_obj)
-                except Exception:
-                    pass
+                self.store.put_json(step_json_key, step_obj)
+            except Exception:
+                pass
 
         self._pending_writes = []
 
+    def _put_json(self, key: str, obj: dict[str, Any]) -> None:
+        # Encode now: obj (the chain in particular) keeps changing after this.
+        if self.recorder.config.metadata_async:
+            if self._metadata_writer is None:
+                self._metadata_writer = _MetadataWriter(self.store)
+            self._metadata_writer.put(key, self.store.encode_json(obj))
+        else:
+            self.store.put_json(key, obj)
+
+    def _drain_metadata_writes(self) -> None:
+        if self._metadata_writer is not None:
+            self._metadata_writer.drain()
+
     def _append_chain_entry(self, typ: str, ts: str, payload_ref: str, payload_obj: dict[str, Any]) -> None:
         if self._chain is None:
             raise RuntimeError("Chain not initialized")
@@ -602,11 +693,14 @@ class Run:
             "digest": dig,
         })
         self._chain["head"] = dig
-        self.store.put_json(self._chain_key(), self._chain)
+        self._put_json(self._chain_key(), self._chain)
 
     def finish(self, *, status: str = "ok", error: str | None = None) -> None:
         finished = utc_now_iso()
 
+        # Everything below reads step/chain JSON back from the store.
+        self._drain_metadata_writes()
+
         # Ensure async snapshot writes are completed before finalizing run metadata.
         if self.recorder.config.snapshot_async:
             self._flush_pending_writes()
@@ -630,12 +724,9 @@ class Run:
         max_run_mb = self.recorder.config.max_run_mb
         if isinstance(self.store, LocalStore) and max_run_mb:
             try:
-                total_bytes = 0
-                for key in self.store.list(self._prefix()):
-                    path = self.store._path(key)
-                    if os.path.exists(path):
-                        total_bytes += os.path.getsize(path)
-                total_mb = total_bytes / (1024 * 1024)
+                # Walk the directory: callers (wrap, dbt artifact copies) also
+                # write under the run prefix directly through the store.
+                total_mb = self.store.size_bytes(self._prefix()) / (1024 * 1024)
                 policy["total_run_mb"] = round(total_mb, 3)
                 policy["max_run_mb"] = float(max_run_mb)
                 if total_mb > float(max_run_mb):
@@ -672,9 +763,7 @@ class Run:
         run_summary["steps"] = steps
 
         if self._events:
-            import json
-            lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in self._events).encode("utf-8")
-            self.store.put_bytes(self._events_key(), lines, content_type="application/jsonl")
+            self.store.put_bytes(self._events_key(), json_lines_bytes(self._events), content_type="application/jsonl")
 
         # Immutable evidence run_finish.json without seal.head
         run_finish = dict(run_summary)
@@ -685,21 +774,94 @@ class Run:
 
         if self.recorder.seal.mode == "chain":
             self._append_chain_entry("run_finish", finished, self._run_finish_key(), run_finish)
-            chain_obj = self.store.get_json(self._chain_key())
+            # The in-memory chain is what was just written; no need to read it back.
             run_summary.setdefault("seal", {})
             if isinstance(run_summary["seal"], dict):
-                run_summary["seal"]["head"] = chain_obj.get("head")
+                run_summary["seal"]["head"] = self._chain["head"]
 
         self.store.put_json(self._run_json_key(), run_summary)
+        if self._metadata_writer is not None:
+            writer, self._metadata_writer = self._metadata_writer, None
+            writer.close()
 
     def verify(self) -> tuple[bool, str]:
         if self.recorder.seal.mode != "chain":
             return True, "seal disabled"
+        self._drain_metadata_writes()
         chain_obj = self.store.get_json(self._chain_key())
         ok, msg = verify_chain_with_payloads(chain_obj, self.store, run_prefix=self._prefix())
         return ok, msg
 
 
+class _MetadataWriter:
+    """
+    One background thread writing a run's JSON objects in queue order.
+
+    Queued writes are taken in batches and coalesced per key, so chain.json,
+    which is rewritten after every step, is stored once per batch.
+    """
+
+    def __init__(self, store: Store, max_batch: int = 256) -> None:
+        self._store = store
+        self._max_batch = max_batch
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._loop, name="blackbox-metadata-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, key: str, data: bytes) -> None:
+        self._q.put((key, data))
+
+    def drain(self) -> None:
+        """
+        Block until everything queued so far is stored; re-raise a failed write.
+        """
+        done = threading.Event()
+        self._q.put(done)
+        done.wait()
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def close(self) -> None:
+        self.drain()
+        self._q.put(None)
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._q.get()
+            batch: dict[str, bytes] = {}
+            waiters: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    key, data = item
+                    batch.pop(key, None)
+                    batch[key] = data
+                    if len(batch) >= self._max_batch:
+                        break
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            for key, data in batch.items():
+                try:
+                    self._store.put_bytes(key, data, content_type="application/json")
+                except BaseException as e:
+                    if self._error is None:
+                        self._error = e
+            for w in waiters:
+                w.set()
+            if stop:
+                return
+
+
 class StreamRun:
     """
     Minimal streaming helper for micro-batch pipelines.
@@ -710,6 +872,7 @@ class StreamRun:
         self._run = run
         self._batch_index = 0
         self._last_df: pd.DataFrame | None = None
+        self._last_meta: dict[str, Any] | None = None
 
     @property
     def run_id(self) -> str:
@@ -730,9 +893,15 @@ class StreamRun:
         if window:
             meta["window"] = window
 
-        with self._run.step(step, input_df=self._last_df, metadata=meta) as st:
+        # The previous batch was fingerprinted (and snapshotted) as that step's
+        # output; reuse its block as this step's input instead of redoing it.
+        # The frame itself is still kept for the rowhash diff.
+        st = self._run.step(step, input_df=self._last_df, metadata=meta)
+        st.input_meta = self._last_meta
+        with st:
             st.capture_output(df)
-        self._last_df = df
+        self._last_df = st._output_df
+        self._last_meta = st._output_meta
 
     def finish(self, *, status: str = "ok", error: str | None = None) -> None:
         self._run.finish(status=status, error=error)
@@ -1,15 +1,60 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterator
 import os
-import json
+
+from .util import json_dumps_bytes, json_loads
 
 
 class StoreError(RuntimeError):
     pass
 
 
+def _is_missing_key_error(e: Exception) -> bool:
+    if isinstance(e, FileNotFoundError):
+        return True
+    # S3/boto3 missing key surfaces as ClientError with response code.
+    code = getattr(e, "response", {}).get("Error", {}).get("Code")
+    return code in {"NoSuchKey", "NotFound", "404", "NoSuchBucket"}
+
+
+def _write_parquet(df: Any, where: Any, *, compression: str | None) -> None:
+    """
+    Write df as Parquet to a path or Arrow/file sink.
+
+    Goes straight to pyarrow (same bytes as df.to_parquet) to skip pandas'
+    engine dispatch, which dominates for small frames such as samples.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pa = None
+    if pa is None or df.attrs:
+        # pandas also stores df.attrs in the file metadata.
+        df.to_parquet(where, index=False, compression=compression)
+        return
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), where, compression=compression)
+
+
+def encode_parquet(df: Any, *, compression: str | None) -> bytes:
+    """
+    Serialize df to Parquet bytes.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        import io
+        buf = io.BytesIO()
+        _write_parquet(df, buf, compression=compression)
+        return buf.getvalue()
+    sink = pa.BufferOutputStream()
+    _write_parquet(df, sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
 class Store:
     def put_bytes(self, key: str, data: bytes, *, content_type: str | None = None) -> None:
         raise NotImplementedError
@@ -17,15 +62,62 @@ class Store:
     def get_bytes(self, key: str) -> bytes:
         raise NotImplementedError
 
+    @staticmethod
+    def encode_json(obj: dict[str, Any]) -> bytes:
+        return json_dumps_bytes(obj, indent=True)
+
     def put_json(self, key: str, obj: dict[str, Any]) -> None:
-        self.put_bytes(
-            key,
-            json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"),
-            content_type="application/json",
-        )
+        self.put_bytes(key, self.encode_json(obj), content_type="application/json")
+
+    @contextmanager
+    def open_writer(self, key: str, *, content_type: str | None = None) -> Iterator[BinaryIO]:
+        """
+        Writable binary handle for key; the object is committed when the block exits.
+
+        Default implementation buffers in memory and calls put_bytes. LocalStore
+        overrides to write straight to disk so large outputs can be streamed.
+        """
+        import io
+        buf = io.BytesIO()
+        yield buf
+        self.put_bytes(key, buf.getvalue(), content_type=content_type)
 
     def get_json(self, key: str) -> dict[str, Any]:
-        return json.loads(self.get_bytes(key).decode("utf-8"))
+        return json_loads(self.get_bytes(key))
+
+    def get_json_many(
+        self,
+        keys: list[str],
+        *,
+        max_workers: int = 16,
+        transform: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> list[Any]:
+        """
+        Fetch several JSON objects at once, in key order. Missing keys map to None.
+
+        Reads run on a thread pool so disk/S3 latency overlaps instead of
+        being paid once per key. transform, if given, is applied to each object
+        right after parsing, so large payloads can be reduced before the whole
+        batch is collected.
+        """
+        if not keys:
+            return []
+
+        def _one(key: str) -> Any:
+            try:
+                obj = self.get_json(key)
+            except Exception as e:
+                if _is_missing_key_error(e):
+                    return None
+                raise
+            return transform(obj) if transform is not None else obj
+
+        # A handful of keys is cheaper to read inline than to start a pool for.
+        if len(keys) < 4 or max_workers <= 1:
+            return [_one(k) for k in keys]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as ex:
+            return list(ex.map(_one, keys))
 
     def put_parquet_df(self, key: str, df: "Any", *, compression: str | None) -> float:
         """
@@ -34,28 +126,30 @@ class Store:
         Default implementation buffers to memory. LocalStore overrides for
         direct-to-disk writes to reduce memory overhead.
         """
-        import io
-        buf = io.BytesIO()
-        df.to_parquet(buf, index=False, compression=compression)
-        data = buf.getvalue()
+        data = encode_parquet(df, compression=compression)
         self.put_bytes(key, data, content_type="application/octet-stream")
         return float(len(data) / (1024 * 1024))
 
     def list(self, prefix: str) -> list[str]:
         raise NotImplementedError
 
+    def iter_list(self, prefix: str) -> Iterator[str]:
+        """
+        Lazily yield keys under prefix (order is backend-defined).
+
+        Default implementation falls back to list(); LocalStore and S3Store
+        override to stream keys without materializing the full listing.
+        """
+        yield from self.list(prefix)
+
     # --- MVP polish: common primitives used by CLI and verification tooling ---
 
     def exists(self, key: str) -> bool:
         try:
             self.get_bytes(key)
             return True
-        except FileNotFoundError:
-            return False
         except Exception as e:
-            # S3/boto3 missing key surfaces as ClientError with response code.
-            code = getattr(e, "response", {}).get("Error", {}).get("Code")
-            if code in {"NoSuchKey", "NotFound", "404", "NoSuchBucket"}:
+            if _is_missing_key_error(e):
                 return False
             raise
 
@@ -91,10 +185,17 @@ class LocalStore(Store):
         with open(path, "wb") as f:
             f.write(data)
 
+    @contextmanager
+    def open_writer(self, key: str, *, content_type: str | None = None) -> Iterator[BinaryIO]:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            yield f
+
     def put_parquet_df(self, key: str, df: "Any", *, compression: str | None) -> float:
         path = self._path(key)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        df.to_parquet(path, index=False, compression=compression)
+        _write_parquet(df, path, compression=compression)
         size_mb = os.path.getsize(path) / (1024 * 1024)
         return float(size_mb)
     def get_bytes(self, key: str) -> bytes:
@@ -103,19 +204,47 @@ class LocalStore(Store):
             return f.read()
 
     def list(self, prefix: str) -> list[str]:
+        return sorted(self.iter_list(prefix))
+
+    def iter_list(self, prefix: str) -> Iterator[str]:
         base = self._path(prefix)
         if not os.path.exists(base):
-            return []
-        out: list[str] = []
+            return
         if os.path.isfile(base):
-            return [prefix]
-        for root, _, files in os.walk(base):
-            for fn in files:
+            yield prefix
+            return
+        for root, dirs, files in os.walk(base):
+            # Walk in name order so callers streaming run ids see them sorted.
+            dirs.sort()
+            for fn in sorted(files):
                 full = os.path.join(root, fn)
                 rel = os.path.relpath(full, self.root)
-                out.append(rel.replace("\\", "/"))
-        out.sort()
-        return out
+                yield rel.replace("\\", "/")
+
+    def size_bytes(self, prefix: str) -> int:
+        """
+        Total size of the files under prefix.
+
+        One scandir walk with cached stat results, rather than listing keys
+        and calling exists()/getsize() per file.
+        """
+        base = self._path(prefix)
+        if os.path.isfile(base):
+            return os.path.getsize(base)
+        total = 0
+        stack = [base]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        total += entry.stat().st_size
+        return total
 
     def list_dirs(self, prefix: str) -> list[str]:
         base = self._path(prefix)
@@ -176,9 +305,11 @@ class S3Store(Store):
         return obj["Body"].read()
 
     def list(self, prefix: str) -> list[str]:
+        return sorted(self.iter_list(prefix))
+
+    def iter_list(self, prefix: str) -> Iterator[str]:
         c = self._client()
         pfx = self._key(prefix)
-        keys: list[str] = []
         token = None
         while True:
             kwargs = dict(Bucket=self.bucket, Prefix=pfx)
@@ -190,16 +321,14 @@ class S3Store(Store):
                 # strip store prefix
                 if self.prefix and k.startswith(self.prefix.rstrip("/") + "/"):
                     k = k[len(self.prefix.rstrip("/")) + 1 :]
-                keys.append(k)
+                yield k
             if not resp.get("IsTruncated"):
                 break
             token = resp.get("NextContinuationToken")
-        keys.sort()
-        return keys
 
     def list_dirs(self, prefix: str) -> list[str]:
         # Infer "directories" from keys under prefix.
-        keys = self.list(prefix)
+        keys = self.iter_list(prefix)
         out = set()
         p = prefix.rstrip("/") + "/"
         for k in keys:
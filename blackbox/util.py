@@ -1,21 +1,111 @@
 from __future__ import annotations
 import json
+import math
 import os
 import platform
+import re
 import socket
 import sys
-from datetime import datetime, timezone
-from typing import Any
+import time
+from typing import Any, Iterable
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional: pip install 'blackbox-data[fast]'
+    _orjson = None
 
 
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    # Same text as datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    # with a "Z" suffix, built from time_ns()/gmtime() without the tzinfo path.
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))}.{ns // 1_000_000:03d}Z"
 
 
 def canonical_json_bytes(obj: Any) -> bytes:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 
+def json_loads(data: bytes | str) -> Any:
+    """
+    Parse JSON with orjson when installed, else the stdlib.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            # stdlib also accepts NaN/Infinity literals; let it decide.
+            pass
+    return json.loads(data)
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(v) for v in obj)
+    return False
+
+
+def _orjson_dumps(obj: Any, option: int) -> bytes | None:
+    # None means "use the stdlib": orjson rejects non-str keys and big ints,
+    # and writes NaN/Infinity as null, which would not read back as the same
+    # object (stored payloads are re-digested on verify).
+    if _orjson is None:
+        return None
+    try:
+        # Types the stdlib rejects (datetime, dataclass) must fail here too.
+        data = _orjson.dumps(obj, option=option | _orjson.OPT_PASSTHROUGH_DATETIME | _orjson.OPT_PASSTHROUGH_DATACLASS)
+    except TypeError:
+        return None
+    if b"null" in data and _has_nonfinite(obj):
+        return None
+    return data
+
+
+def json_dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    UTF-8 JSON for stored metadata (orjson when installed).
+    """
+    data = _orjson_dumps(obj, _orjson.OPT_INDENT_2 if indent and _orjson is not None else 0)
+    if data is not None:
+        return data
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def json_lines_bytes(objs: Iterable[Any]) -> bytes:
+    """
+    Newline-delimited JSON (one compact object per line) in a single buffer.
+    """
+    buf = bytearray()
+    newline = _orjson.OPT_APPEND_NEWLINE if _orjson is not None else 0
+    for obj in objs:
+        data = _orjson_dumps(obj, newline)
+        if data is None:
+            data = json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+        buf += data
+    return bytes(buf)
+
+
+def json_dumps_pretty_bytes(obj: Any) -> bytes:
+    """
+    Indented, key-sorted UTF-8 JSON for CLI output (orjson when installed).
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Non-str keys, big ints, etc.: fall back to the stdlib encoder.
+            pass
+    return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+
+
+def json_dumps_pretty(obj: Any) -> str:
+    return json_dumps_pretty_bytes(obj).decode("utf-8")
+
+
 def get_runtime_info() -> dict[str, Any]:
     return {
         "python": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
@@ -31,11 +121,17 @@ def get_host_info() -> dict[str, Any]:
     }
 
 
+# Already-safe identifiers (the common case) skip the per-character rebuild.
+_SAFE_COMPONENT_RE = re.compile(r"\A[A-Za-z0-9_-]+\Z")
+
+
 def safe_path_component(value: str, *, max_len: int = 64) -> str:
     """
     Normalize user-provided identifiers for safe filesystem usage.
     """
     if not isinstance(value, str):
         value = str(value)
+    if len(value) <= max_len and _SAFE_COMPONENT_RE.match(value):
+        return value
     cleaned = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in value)
     return cleaned[:max_len]
@@ -1,6 +1,6 @@
 import pandas as pd
 import pytest
-from blackbox.hashing import diff_rowhash
+from blackbox.hashing import column_hashes, content_fingerprint_rowhash, diff_rowhash
 
 def test_diff_rowhash_added_removed():
     a = pd.DataFrame({"x":[1,2,3]})
@@ -47,3 +47,63 @@ def test_diff_rowhash_chunked_matches():
     payload2, summary2 = diff_rowhash(a, b, primary_key=["id"], chunk_rows=2)
     assert summary1 == summary2
     assert payload1["summary"] == payload2["summary"]
+
+def test_diff_rowhash_chunked_int_vs_str_keys():
+    a = pd.DataFrame({"id":[1,2,3,4], "x":[10, 20, 30, 40]})
+    b = pd.DataFrame({"id":["1","3","4","5"], "x":[10, 99, 40, 50]})
+    payload, summary = diff_rowhash(a, b, primary_key=["id"], chunk_rows=2)
+    assert (summary.added, summary.removed, summary.changed) == (1, 1, 1)
+    assert payload["added_keys"] == ["5"]
+    assert payload["removed_keys"] == ["2"]
+    assert payload["changed_keys"] == ["3"]
+
+def test_content_fingerprint_precomputed_matches():
+    df = pd.DataFrame({"id":[1,2,3], "email":["a@x", "b@x", "c@x"], "country":["US", "US", "CA"]})
+    pre = column_hashes(df, ["email", "country"])
+    assert content_fingerprint_rowhash(df, precomputed=pre) == content_fingerprint_rowhash(df)
+
+def test_diff_rowhash_reuses_fingerprint_column_hashes():
+    a = pd.DataFrame({"id":[1,2,3,4], "x":[10, 20, 30, 40], "s":["a", "b", "c", "d"]})
+    b = pd.DataFrame({"id":[1,3,4,5], "x":[10, 99, 40, 50], "s":["a", "c", "d", "e"]})
+    a_pre, b_pre = {}, {}
+    content_fingerprint_rowhash(a, column_hashes_out=a_pre)
+    content_fingerprint_rowhash(b, column_hashes_out=b_pre)
+    assert set(a_pre) == {"id", "x", "s"}
+    expected, _ = diff_rowhash(a, b, primary_key=["id"])
+    for chunk_rows in (0, 2):
+        payload, _ = diff_rowhash(
+            a, b, primary_key=["id"], chunk_rows=chunk_rows, a_precomputed=a_pre, b_precomputed=b_pre
+        )
+        assert payload["changed_keys"] == expected["changed_keys"]
+        assert payload["summary"] == expected["summary"]
+
+def test_diff_rowhash_native_polars():
+    pl = pytest.importorskip("polars")
+    a = pl.DataFrame({"id":[1,2,3], "x":[1,2,3]})
+    b = pl.DataFrame({"id":[2,3,5], "x":[2,9,1]})
+    payload, summary = diff_rowhash(a, b, primary_key=["id"], native_polars=True)
+    assert (summary.added, summary.removed, summary.changed) == (1, 1, 1)
+    assert payload["added_keys"] == ["5"]
+    assert payload["changed_keys"] == ["3"]
+
+def test_diff_rowhash_process_parallel_matches():
+    cols = {f"c{i}": list(range(i, i + 50)) for i in range(6)}
+    a = pd.DataFrame({"id": list(range(50)), **cols})
+    b = a.copy()
+    b.loc[::7, "c2"] += 1
+    _, summary1 = diff_rowhash(a, b, primary_key=["id"], auto_parallel_wide=False)
+    _, summary2 = diff_rowhash(
+        a, b, primary_key=["id"], auto_parallel_wide=True, auto_parallel_threshold_cols=4,
+        auto_hash_group_size=2, auto_parallel_workers=2, auto_parallel_process_cells=1,
+    )
+    assert summary1 == summary2
+
+def test_native_polars_lazyframe_matches_eager():
+    pl = pytest.importorskip("polars")
+    a = pl.DataFrame({"id":[1,2,3], "x":[1,2,3]})
+    b = pl.DataFrame({"id":[2,3,5], "x":[2,9,1]})
+    eager, _ = diff_rowhash(a, b, primary_key=["id"], native_polars=True)
+    lazy, _ = diff_rowhash(a.lazy(), b.lazy(), primary_key=["id"], native_polars=True)
+    assert lazy["summary"] == eager["summary"]
+    assert lazy["changed_keys"] == eager["changed_keys"]
+    assert content_fingerprint_rowhash(a.lazy(), native_polars=True) == content_fingerprint_rowhash(a, native_polars=True)
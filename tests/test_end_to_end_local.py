@@ -32,7 +32,97 @@ def test_end_to_end_local(tmp_path):
     assert any(k.endswith("/input.bbdata") for k in keys)
     assert any(k.endswith("/output.bbdata") for k in keys)
     assert any(k.endswith("/diff.bbdelta") for k in keys)
+    assert sorted(store.iter_list("acme-data/users_daily/" + run.run_id)) == keys
+    step_keys = [k for k in keys if k.endswith("/step.json")]
+    fetched = store.get_json_many(step_keys + ["acme-data/users_daily/missing.json"])
+    assert fetched[:-1] == [store.get_json(k) for k in step_keys]
+    assert fetched[-1] is None
 
     ok, msg = run.verify()
     assert ok, msg
 
+
+def test_cli_cleanup_uses_run_json_age(tmp_path):
+    import os
+    from blackbox.cli import main
+    store = Store.local(str(tmp_path))
+    store.put_json("p/d/old/run.json", {"created_at": "2020-01-01T00:00:00.000Z"})
+    store.put_json("p/d/new/run.json", {"created_at": "2999-01-01T00:00:00.000Z"})
+    store.put_json("p/d/nots/run.json", {"status": "ok"})
+    store.put_json("p/d/badts/run.json", {"created_at": "garbage"})
+    store.put_bytes("p/d/corrupt/run.json", b"{not json")
+    for run_id in ("old", "nots", "badts", "corrupt"):
+        os.utime(store._path(f"p/d/{run_id}/run.json"), (0, 0))
+    assert main(["--root", str(tmp_path), "cleanup", "--retention-days", "1"]) == 0
+    assert store.list_dirs("p/d") == ["badts", "corrupt", "new", "nots"]
+
+def test_cli_verify_cache_sees_payload_tamper(tmp_path, monkeypatch):
+    from blackbox.cli import main
+    monkeypatch.setenv("BLACKBOX_CACHE_DIR", str(tmp_path / "cache"))
+    root = str(tmp_path / "store")
+    store = Store.local(root)
+    rec = Recorder(store=store, project="p", dataset="d", diff=DiffConfig(mode="none"), snapshot=SnapshotConfig(mode="none"))
+    run = rec.start_run(run_id="r1")
+    with run.step("s1", input_df=pd.DataFrame({"x": [1]})) as st:
+        st.capture_output(pd.DataFrame({"x": [2]}))
+    run.finish()
+
+    args = ["--root", root, "verify", "--project", "p", "--dataset", "d", "--run-id", "r1"]
+    assert main(args) == 0
+    assert not (tmp_path / "cache").exists()  # opt-in only
+
+    monkeypatch.setenv("BLACKBOX_VERIFY_CACHE", "1")
+    assert main(args) == 0
+    assert main(args) == 0  # served from the verify cache
+
+    step_key = next(k for k in store.list("p/d/r1") if k.endswith("/step.json"))
+    obj = store.get_json(step_key)
+    obj["name"] = "tampered"
+    store.put_json(step_key, obj)
+    assert main(args) == 1
+
+def test_metadata_async_run_verifies(tmp_path):
+    from blackbox import RecorderConfig
+    store = Store.local(str(tmp_path))
+    rec = Recorder(
+        store=store,
+        project="acme-data",
+        dataset="users_daily",
+        diff=DiffConfig(mode="rowhash"),
+        snapshot=SnapshotConfig(mode="none"),
+        seal=SealConfig(mode="chain"),
+        config=RecorderConfig(metadata_async=True),
+    )
+    run = rec.start_run()
+    df = pd.DataFrame({"user_id":[1,2,3]})
+    for i in range(5):
+        with run.step(f"s{i}", input_df=df) as st:
+            st.capture_output(df)
+    run.finish(status="ok")
+
+    ok, msg = run.verify()
+    assert ok, msg
+    assert len(store.get_json("acme-data/users_daily/" + run.run_id + "/run.json")["steps"]) == 5
+
+def test_max_run_mb_counts_files_written_through_store(tmp_path):
+    from blackbox import RecorderConfig
+    store = Store.local(str(tmp_path))
+    rec = Recorder(store=store, project="acme-data", dataset="users_daily", config=RecorderConfig(max_run_mb=1))
+    run = rec.start_run()
+    prefix = "acme-data/users_daily/" + run.run_id
+    with store.open_writer(prefix + "/steps/0001_wrap/artifacts/stdout.txt") as out:
+        out.write(b"x" * (2 * 1024 * 1024))
+    run.finish(status="ok")
+
+    policy = store.get_json(prefix + "/run.json")["policy"]
+    assert policy["total_run_mb"] > 2
+    assert "max_run_size_exceeded" in policy["violations"]
+
+def test_deep_memory_estimate_measures_string_columns():
+    from blackbox.recorder import _deep_memory_bytes
+    df = pd.DataFrame({
+        "s": pd.Series(["x" * 200] * 1000, dtype="string[python]"),
+        "o": pd.Series(["y" * 50] * 1000, dtype=object),
+        "n": range(1000),
+    })
+    assert _deep_memory_bytes(df) == int(df.memory_usage(index=True, deep=True).sum())
@@ -5,8 +5,8 @@ import pandas as pd
 
 from blackbox import Recorder, Store, DiffConfig, SnapshotConfig, SealConfig
 from blackbox.integrations.airflow import blackbox_task
-from blackbox.integrations.dagster import blackbox_op
-from blackbox.integrations.dbt import collect_dbt_artifacts
+from blackbox.integrations.dagster import blackbox_op, finish_dagster_run, start_dagster_run
+from blackbox.integrations.dbt import collect_dbt_artifacts, load_dbt_run_results
 from blackbox.seal import verify_chain_with_payloads
 
 
@@ -66,6 +66,55 @@ def test_dagster_wrapper_records_run(tmp_path):
     assert ok, msg
 
 
+def test_dagster_ops_share_job_run(tmp_path):
+    store = Store.local(str(tmp_path))
+    rec = Recorder(
+        store=store,
+        project="acme",
+        dataset="dagster_job",
+        diff=DiffConfig(mode="none"),
+        snapshot=SnapshotConfig(mode="none"),
+        seal=SealConfig(mode="chain"),
+    )
+
+    run = start_dagster_run(rec)
+    blackbox_op(rec, "op1", lambda: pd.DataFrame({"id": [1]}))()
+    blackbox_op(rec, "op2", lambda: pd.DataFrame({"id": [2]}))()
+    finish_dagster_run(run)
+
+    assert store.list_dirs("acme/dagster_job") == [run.run_id]
+    prefix = f"acme/dagster_job/{run.run_id}"
+    chain = store.get_json(f"{prefix}/chain.json")
+    ok, msg = verify_chain_with_payloads(chain, store, run_prefix=prefix)
+    assert ok, msg
+
+
+def test_dagster_op_ignores_unrelated_active_run(tmp_path):
+    from blackbox.context import set_active_run
+
+    store = Store.local(str(tmp_path))
+    rec = Recorder(
+        store=store,
+        project="acme",
+        dataset="dagster_other",
+        diff=DiffConfig(mode="none"),
+        snapshot=SnapshotConfig(mode="none"),
+        seal=SealConfig(mode="chain"),
+    )
+
+    other = rec.start_run()
+    set_active_run(other)
+    try:
+        blackbox_op(rec, "op1", lambda: pd.DataFrame({"id": [1]}))()
+    finally:
+        set_active_run(None)
+    other.finish()
+
+    run_ids = store.list_dirs("acme/dagster_other")
+    assert len(run_ids) == 2 and other.run_id in run_ids
+    assert store.list_dirs(f"acme/dagster_other/{other.run_id}/steps") == []
+
+
 def test_dbt_artifact_collection(tmp_path):
     root = str(tmp_path)
     target = os.path.join(root, "target")
@@ -80,3 +129,128 @@ def test_dbt_artifact_collection(tmp_path):
     artifacts = collect_dbt_artifacts(root)
     assert "run_results.json" in artifacts
     assert "manifest.json" in artifacts
+
+
+def test_dbt_run_results_summary(tmp_path):
+    path = os.path.join(str(tmp_path), "run_results.json")
+    run_results = {
+        "metadata": {"invocation_id": "abc", "generated_at": "now"},
+        "elapsed_time": 1.5,
+        "results": [{"status": "success"}, {"status": "error"}, {"status": "success"}, {}],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run_results, f)
+
+    summary = load_dbt_run_results(path)
+    assert summary["dbt_invocation_id"] == "abc"
+    assert summary["dbt_results"] == 4
+    assert summary["dbt_status_counts"] == {"success": 2, "error": 1, "unknown": 1}
+
+
+def test_aggregate_sql_validates_identifiers():
+    import pytest
+    from blackbox.integrations.warehouses import aggregate_sql
+
+    sql = aggregate_sql("sales.orders", ["country"], {"n": ("count", "*"), "rev": ("sum", "amount")}, limit=10)
+    assert sql == "SELECT country, COUNT(*) AS n, SUM(amount) AS rev FROM sales.orders GROUP BY country LIMIT 10"
+    with pytest.raises(ValueError, match="Invalid SQL identifier"):
+        aggregate_sql("orders; drop table x", [], {"n": ("count", "*")})
+
+
+def test_load_sources_returns_independent_copies(tmp_path):
+    import pytest
+    pytest.importorskip("yaml")
+    from blackbox.integrations.warehouses import load_sources
+
+    cfg = tmp_path / "warehouses.yml"
+    cfg.write_text("sources:\n  pg:\n    kind: postgres\n    host: db\n    connect_args: {sslmode: require}\n")
+    first = load_sources(str(cfg))
+    first["pg"].options["host"] = "elsewhere"
+    first["pg"].options["connect_args"]["sslmode"] = "disable"
+    first.pop("pg")
+
+    again = load_sources(str(cfg))
+    assert again["pg"].options["host"] == "db"
+    assert again["pg"].options["connect_args"] == {"sslmode": "require"}
+
+
+def test_sql_url_escapes_credentials():
+    import pytest
+    sa = pytest.importorskip("sqlalchemy")
+    from blackbox.integrations.warehouses import _sql_url
+
+    url = _sql_url("postgres", {"user": "a@b:c", "password": "p@ss:w/rd%1", "host": "db", "port": 5432, "database": "app"})
+    parsed = sa.make_url(url)
+    assert (parsed.username, parsed.password, parsed.host, parsed.port, parsed.database) == (
+        "a@b:c", "p@ss:w/rd%1", "db", 5432, "app"
+    )
+    assert parsed.drivername == "postgresql+psycopg2"
+    assert _sql_url("postgres", {"url": "postgresql://x/y"}) == "postgresql://x/y"
+
+
+def test_engine_cache_keyed_by_url_and_pool_size(monkeypatch):
+    from types import SimpleNamespace
+    from blackbox.integrations import warehouses as wh
+
+    created = []
+
+    def _create_engine(url, **kwargs):
+        created.append((url, kwargs["pool_size"]))
+        return object()
+
+    monkeypatch.setattr(wh, "_ENGINES", {})
+    monkeypatch.setattr(wh, "_sqlalchemy", lambda: SimpleNamespace(create_engine=_create_engine))
+    first = wh._engine_for("postgresql://db/app", {})
+    assert wh._engine_for("postgresql://db/app", {"pool_size": 5}) is first
+    assert wh._engine_for("postgresql://db/app", {"pool_size": 10}) is not first
+    assert wh._engine_for("postgresql://db/other", {}) is not first
+    assert created == [("postgresql://db/app", 5), ("postgresql://db/app", 10), ("postgresql://db/other", 5)]
+
+
+def test_load_dataframe_result_cache_copies_and_expires(monkeypatch):
+    from blackbox.integrations import warehouses as wh
+
+    calls = []
+
+    def _load_result(source, sql, **kwargs):
+        calls.append(sql)
+        return pd.DataFrame({"id": [1, 2]})
+
+    clock = [100.0]
+    monkeypatch.setattr(wh, "_RESULT_CACHE", {})
+    monkeypatch.setattr(wh, "_load_result", _load_result)
+    monkeypatch.setattr(wh.time, "monotonic", lambda: clock[0])
+    src = wh.WarehouseSource(name="pg", kind="postgres", options={})
+
+    first = wh.load_dataframe(src, "select 1", cache_ttl=60)
+    first.loc[0, "id"] = 99
+    second = wh.load_dataframe(src, "select 1", cache_ttl=60)
+    assert calls == ["select 1"]
+    assert second["id"].tolist() == [1, 2]
+    second.loc[1, "id"] = 42
+    assert wh.load_dataframe(src, "select 1", cache_ttl=60)["id"].tolist() == [1, 2]
+
+    clock[0] += 61
+    wh.load_dataframe(src, "select 1", cache_ttl=60)
+    assert calls == ["select 1", "select 1"]
+    wh.load_dataframe(src, "select 1")
+    assert len(calls) == 3
+
+
+def test_load_dataframe_return_type_dispatch(monkeypatch):
+    import pyarrow as pa
+    import pytest
+    from blackbox.integrations import warehouses as wh
+
+    monkeypatch.setattr(wh, "_load_dataframe", lambda source, sql, **kwargs: pd.DataFrame({"id": [1, 2]}))
+    src = wh.WarehouseSource(name="pg", kind="postgres", options={"url": "postgresql://db/app"})
+
+    assert isinstance(wh.load_dataframe(src, "select 1"), pd.DataFrame)
+    table = wh.load_dataframe(src, "select 1", return_type="arrow")
+    assert isinstance(table, pa.Table) and table.column("id").to_pylist() == [1, 2]
+    with pytest.raises(ValueError, match="Unsupported return_type"):
+        wh.load_dataframe(src, "select 1", return_type="numpy")
+
+    pl = pytest.importorskip("polars")
+    out = wh.load_dataframe(src, "select 1", return_type="polars")
+    assert isinstance(out, pl.DataFrame) and out["id"].to_list() == [1, 2]
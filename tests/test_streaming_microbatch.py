@@ -29,3 +29,8 @@ def test_streaming_microbatch(tmp_path):
     keys = store.list("acme-data/stream_demo/" + stream.run_id)
     assert any(k.endswith("/step.json") for k in keys)
     assert any(k.endswith("/diff.bbdelta") for k in keys)
+
+    # The second batch reuses the first batch's output block as its input.
+    steps = sorted(k for k in keys if k.endswith("/step.json"))
+    first, second = store.get_json(steps[0]), store.get_json(steps[1])
+    assert second["input"] == first["output"]